@@ -1,10 +1,12 @@
 import os
+import multiprocessing
 os.environ["PYTHONIOENCODING"] = "utf-8"
 import tkinter as tk
 
 from gui import VideoConverterApp
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Video batches are encoded in worker processes
     root = tk.Tk()
     app = VideoConverterApp(root)
     root.mainloop()
\ No newline at end of file
@@ -2,12 +2,26 @@ from PIL import Image, ImageDraw, ImageFont, ImageColor, ImageOps
 import html
 import logging
 import os
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 from utils.style_parser import StyleParser
-from processors.sub2audio import SubToAudio
 from pydub import AudioSegment
 from utils.helpers import TempFileManager
 
+# Settings that change how a plain caption is drawn, with their defaults. They are
+# part of the render cache key so a settings change never reuses a stale frame.
+RENDER_SETTING_DEFAULTS = {
+    'font_size': 24,
+    'margin': 20,
+    'text_color': '#FFFFFF',
+    'text_border': True,
+    'bg_color': '#000000',
+    'background_image': None,
+    'custom_font': None,
+}
+# Rendered frames are full 1280x720 RGB images (~2.7 MB each), repeats are usually close together
+RENDER_CACHE_SIZE = 16
+
 class ImageGenerator:
     """Handles the generation of caption images with various styles and effects."""
     
@@ -20,7 +34,7 @@ class ImageGenerator:
 
         if 'frame_delay' not in self.settings:
             self.settings['frame_delay'] = 1.0
-        # font_cache keyed by (face, size, bold, italic)
+        # font_cache keyed by (face, size, bold, italic, custom font path)
         self.font_cache = {}
         
         # Ensure required settings have defaults
@@ -29,6 +43,17 @@ class ImageGenerator:
         if 'margin' not in self.settings:
             self.settings['margin'] = 20
 
+        # Identical captions (e.g. repeated "..." frames) are drawn once per generator
+        self._render_subtitle_image = lru_cache(maxsize=RENDER_CACHE_SIZE)(self._render_simple_image)
+        # The background is decoded and resized once, each frame starts from a copy of it
+        self._base_template = lru_cache(maxsize=1)(self._load_base_image)
+
+    def clear_caches(self) -> None:
+        """Drop cached fonts, backgrounds and rendered captions, e.g. after a settings reset"""
+        self.font_cache.clear()
+        self._render_subtitle_image.cache_clear()
+        self._base_template.cache_clear()
+
     def _adjust_duration(self, base_duration: float) -> float:
         """Apply frame delay and other timing adjustments"""
         adjusted = base_duration + self.settings.get('frame_delay', 0.7)
@@ -90,30 +115,7 @@ class ImageGenerator:
 
     def generate_simple_image(self, entry: Dict, idx: int) -> Optional[Dict]:
         try:
-            img = self.create_base_image().convert('RGB')
-            draw = ImageDraw.Draw(img)
-            text = html.unescape(entry['text'])
-            font_size = self.settings.get('font_size', 24)
-            margin = self.settings.get('margin', 20)
-            
-            font = self.get_font('Arial', font_size, False, False)
-            wrapped = self.wrap_text(text, font, 1280 - (2 * margin))
-            
-            total_height = sum((font.getbbox(line)[3] - font.getbbox(line)[1]) for line in wrapped)
-            y = max(margin, (720 - total_height) // 2)
-            
-            for line in wrapped:
-                bbox = font.getbbox(line)
-                text_width = bbox[2] - bbox[0]
-                x = max(margin, (1280 - text_width) // 2)
-                
-                if self.settings.get('text_border', True):
-                    self.draw_text_border(draw, line, (x, y), font)
-                    
-                draw.text((x, y), line, font=font, 
-                        fill=self.settings.get('text_color', '#FFFFFF'))
-                y += (bbox[3] - bbox[1])
-                
+            img = self._render_subtitle_image(html.unescape(entry['text']), self._render_settings())
             path = os.path.join(self.temp_manager.image_dir, f"frame_{idx:08d}.png")
             self._save_image(img, path)
             
@@ -128,6 +130,34 @@ class ImageGenerator:
             logging.error(f"Simple image failed: {str(e)}")
             return None
 
+    def _render_settings(self) -> Tuple:
+        """Current values of the settings a plain caption depends on"""
+        return tuple(self.settings.get(key, default) for key, default in RENDER_SETTING_DEFAULTS.items())
+
+    def _render_simple_image(self, text: str, render_settings: Tuple) -> Image.Image:
+        """Draw a plain caption. Results are cached, so callers must not modify the returned image"""
+        font_size, margin, text_color, text_border, _, _, _ = render_settings
+        img = self.create_base_image()
+        draw = ImageDraw.Draw(img)
+        
+        font = self.get_font('Arial', font_size, False, False)
+        wrapped = self.wrap_text(text, font, 1280 - (2 * margin))
+        
+        total_height = sum((font.getbbox(line)[3] - font.getbbox(line)[1]) for line in wrapped)
+        y = max(margin, (720 - total_height) // 2)
+        
+        for line in wrapped:
+            bbox = font.getbbox(line)
+            text_width = bbox[2] - bbox[0]
+            x = max(margin, (1280 - text_width) // 2)
+            
+            if text_border:
+                self.draw_text_border(draw, line, (x, y), font)
+                
+            draw.text((x, y), line, font=font, fill=text_color)
+            y += (bbox[3] - bbox[1])
+        return img
+
     def generate_styled_image(self, entry: Dict, idx: int) -> Optional[Dict]:
         if not entry or 'text' not in entry:
             logging.error("Invalid entry data")
@@ -202,7 +232,8 @@ class ImageGenerator:
         if not base_name.startswith("frame_") or not base_name.endswith(".png"):
             raise ValueError("Invalid filename format")    
         
-        img.save(path)
+        # Frames are temporary and read back once by the encoder, fast compression is enough
+        img.save(path, optimize=False, compress_level=1)
         logging.debug(f"Saved image: {path}")
         
         if not os.path.exists(path):
@@ -232,22 +263,30 @@ class ImageGenerator:
 
     def create_base_image(self) -> Image.Image:
         """Create base image with proper settings validation"""
+        return self._base_template(
+            self.settings.get('background_image'),
+            self.settings.get('bg_color', '#000000')
+        ).copy()
+
+    def _load_base_image(self, background_image: Optional[str], bg_color: str) -> Image.Image:
+        """Build the RGB frame background. Results are cached, so callers must copy the returned image"""
         try:
-            if self.settings.get('background_image'):
-                img = Image.open(self.settings['background_image'])
-                img = img.convert('RGB').resize((1280, 720))
-                #logging.info(f"Using background image: {self.settings['background_image']}")
+            if background_image:
+                # Close the source file as soon as it is decoded
+                with Image.open(background_image) as src:
+                    img = src.convert('RGB').resize((1280, 720))
+                #logging.info(f"Using background image: {background_image}")
                 return img
         except Exception as e:
             logging.error(f"Background image error: {str(e)}")
         
-        bg_color = self.settings.get('bg_color', '#000000')
         #logging.info(f"Using background color: {bg_color}")
         return Image.new('RGB', (1280, 720), bg_color)
 
     def get_font(self, face: str, size: int, bold: bool, italic: bool) -> ImageFont.FreeTypeFont:
         """Improved font loading with caching and better error handling"""
-        key = (face, size, bold, italic)
+        # The custom font replaces the face, so it is part of the key
+        key = (face, size, bold, italic, self.settings.get('custom_font'))
         if key in self.font_cache:
             return self.font_cache[key]
         
@@ -1,7 +1,13 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import re
 import logging
 
+# [HH:]MM:SS[,mmm] in a single scan; leading BOM/narrow no-break spaces are skipped
+TIMECODE_PATTERN = re.compile(r'[\s\ufeff\u202f]*(?:(\d+):)?(\d+):(\d+)(?:[,.](\d+))?\s*\Z')
+# Timing line used when shifting subtitle timecodes
+# Format: 00:00:00,000 --> 00:00:00,000
+SRT_TIMECODE_PATTERN = re.compile(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})')
+
 class SRTParser:
     def __init__(self):
         self.time_pattern = re.compile(
@@ -18,7 +24,8 @@ class SRTParser:
                 raw_entries = re.split(r'\n\s*\n', content.strip())
             
                 for idx, raw_entry in enumerate(raw_entries):
-                    entry = self.parse_entry(raw_entry)
+                    # Blocks without a timing arrow can never parse, skip them before any regex work
+                    entry = self.parse_entry(raw_entry) if '-->' in raw_entry else None
                     if entry:
                         entry['index'] = idx + 1
                         entries.append(entry)
@@ -40,9 +47,10 @@ class SRTParser:
     def parse_entry(self, raw_entry: str) -> Optional[Dict]:
         lines = [line.strip() for line in raw_entry.split('\n') if line.strip()]
         
-        logging.debug(f"Parsing entry: {raw_entry[:100]}")
+        logging.debug("Parsing entry: %s", raw_entry[:100])
 
-        if len(lines) < 2 or not self.time_pattern.search(lines[1]):
+        # Cheap literal check before running the time regex
+        if len(lines) < 2 or '-->' not in lines[1]:
             logging.error(f"Entry is invalid or missing required lines: {lines}")
             return None
 
@@ -51,21 +59,18 @@ class SRTParser:
             logging.error(f"Invalid time format in entry: {lines[1]}")
             return None
 
-        try:
-            start = self.parse_time(time_match.group(1))
-            end = self.parse_time(time_match.group(2))
-            if start >= end:
-                logging.error(f"Start time is not before end time: {lines[1]}")
-                return None
-            return {
-                'start_time': start,  # Ensure keys match exactly here
-                'end_time': end,
-                'duration': end - start,
-                'text': self.clean_html(' '.join(lines[2:])) if len(lines) > 2 else ''
-            }
-        except Exception as e:
-            logging.error(f"Error parsing entry: {lines} - {str(e)}")
+        # parse_time handles its own errors, so no exception handling is needed here
+        start = self.parse_time(time_match.group(1))
+        end = self.parse_time(time_match.group(2))
+        if start >= end:
+            logging.error(f"Start time is not before end time: {lines[1]}")
             return None
+        return {
+            'start_time': start,  # Ensure keys match exactly here
+            'end_time': end,
+            'duration': end - start,
+            'text': self.clean_html(' '.join(lines[2:])) if len(lines) > 2 else ''
+        }
 
     def clean_html(self, text: str) -> str:
         allowed_tags = {'b', 'i', 'font', 'center'}
@@ -96,31 +101,124 @@ class SRTParser:
             return 0
         
     def parse_time(self, time_str: str) -> float:
-        time_str = time_str.replace(',', '.')
-        parts = time_str.split(':')
-        try:
-            if len(parts) == 3:
-                hours, mins, secs_msecs = parts
-            elif len(parts) == 2:
-                hours = '0'
-                mins, secs_msecs = parts
-            else:
-                raise ValueError("Invalid time format")
-            
-            if '.' in secs_msecs:
-                secs, msecs = secs_msecs.split('.')
-                msecs = msecs.ljust(3, '0')[:3]
-            else:
-                secs = secs_msecs
-                msecs = '000'
-
-            total_seconds = (
-                int(hours) * 3600 +
-                int(mins) * 60 +
-                int(secs) +
-                int(msecs) / 1000.0
-            )
-            return total_seconds
-        except Exception as e:
-            logging.error(f"Time parse error: {time_str} - {e}")
+        match = TIMECODE_PATTERN.match(time_str)
+        if not match:
+            logging.error(f"Time parse error: {time_str} - Invalid time format")
             return 0.0
+        hours, mins, secs, msecs = match.groups()
+        return (
+            int(hours or 0) * 3600 +
+            int(mins) * 60 +
+            int(secs) +
+            int((msecs or '0').ljust(3, '0')[:3]) / 1000.0
+        )
+
+def adjust_srt(input_path: str, delay_ms: int, output_path: str) -> str:
+    """Shift every SRT timecode by delay_ms, writing the result to output_path.
+
+    Returns:
+        output_path on success, or input_path when the file cannot be adjusted
+    """
+    try:
+        logging.info(f"Adjusting SRT file: {input_path} with delay {delay_ms}ms")
+
+        def adjust_timecode(match):
+            # Convert matched groups to integers
+            h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
+
+            # Convert to milliseconds
+            time1_ms = h1 * 3600000 + m1 * 60000 + s1 * 1000 + ms1
+            time2_ms = h2 * 3600000 + m2 * 60000 + s2 * 1000 + ms2
+
+            # Apply delay
+            time1_ms += delay_ms
+            time2_ms += delay_ms
+
+            # Ensure times are not negative
+            time1_ms = max(0, time1_ms)
+            time2_ms = max(0, time2_ms)
+
+            # Convert back to timecode format, keeping everything in ms until the one format call
+            h1, rem = divmod(time1_ms, 3600000)
+            m1, rem = divmod(rem, 60000)
+            s1, ms1 = divmod(rem, 1000)
+
+            h2, rem = divmod(time2_ms, 3600000)
+            m2, rem = divmod(rem, 60000)
+            s2, ms2 = divmod(rem, 1000)
+
+            # Format back to timecode
+            return f"{h1:02d}:{m1:02d}:{s1:02d},{ms1:03d} --> {h2:02d}:{m2:02d}:{s2:02d},{ms2:03d}"
+
+        # Try multiple encodings to handle different file formats
+        encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
+        entry_count = timecode_count = 0
+
+        for encoding in encodings:
+            try:
+                # Text mode uses universal newlines, so \r\n and \r endings are normalized
+                with open(input_path, 'r', encoding=encoding) as src, \
+                        open(output_path, 'w', encoding='utf-8') as dst:
+                    entry_count, timecode_count = _stream_adjusted_srt(src, dst, adjust_timecode)
+                logging.info(f"Successfully read SRT file with encoding: {encoding}")
+                break
+            except UnicodeDecodeError:
+                continue
+
+        if not entry_count:
+            raise RuntimeError(f"SRT file is empty or cannot be decoded: {input_path}")
+
+        if not timecode_count:
+            logging.warning("No timecodes found in adjusted SRT file")
+            # If no timecodes found, use original file as fallback
+            logging.info(f"Using original SRT file as fallback")
+            return input_path
+
+        logging.info(f"Adjusted SRT has {entry_count} entries")
+        logging.info(f"SRT adjustment completed, saved to: {output_path}")
+        return output_path
+    except Exception as e:
+        logging.error(f"Error adjusting SRT directly: {e}", exc_info=True)
+        # Fall back to original file if adjustment fails
+        logging.info(f"Using original SRT file as fallback due to error")
+        return input_path
+
+def _stream_adjusted_srt(src, dst, adjust_timecode) -> Tuple[int, int]:
+    """Shift an SRT one block at a time, writing each block as soon as it is complete.
+
+    Returns:
+        Tuple of (entries written, timecodes adjusted)
+    """
+    entry_count = timecode_count = 0
+    current_block = []
+
+    def flush_block():
+        nonlocal entry_count, timecode_count
+        adjusted_lines = []
+        block_timecodes = 0
+        for line in current_block:
+            line, count = SRT_TIMECODE_PATTERN.subn(adjust_timecode, line)
+            block_timecodes += count
+            adjusted_lines.append(line)
+
+        # Check if first entry has valid format (number, timecode, text)
+        if not entry_count and (len(current_block) < 2 or not block_timecodes):
+            logging.error(f"Invalid SRT format: first entry doesn't match expected format")
+            logging.error("First entry: %s", '\n'.join(current_block))
+            raise RuntimeError("Invalid SRT format: first entry doesn't match expected format")
+
+        dst.write('\n'.join(adjusted_lines) + '\n\n')
+        entry_count += 1
+        timecode_count += block_timecodes
+        current_block.clear()
+
+    for line in src:
+        line = line.rstrip('\n')
+        if line:
+            current_block.append(line)
+        elif current_block:
+            flush_block()
+    if current_block:
+        flush_block()
+
+    return entry_count, timecode_count
@@ -10,6 +10,7 @@ from TTS.api import TTS
 from pydub import AudioSegment
 from TTS.utils.manage import ModelManager
 manager = ModelManager()
+HTML_TAG_PATTERN = re.compile(r'<.*?>')
                                
 class SubToAudio:
 
@@ -65,6 +66,7 @@ class SubToAudio:
                        save_temp:bool=False,
                        speed:float=None,
                        emotion:str=None,
+                       progress_callback=None,
                        **kwargs,
                       ):
 
@@ -111,7 +113,7 @@ class SubToAudio:
     with tempfile.TemporaryDirectory() as temp_folder:
       print("Temporary folder:", temp_folder)
 
-      for entry_data in data:
+      for done, entry_data in enumerate(data, 1):
         audio_path = f"{temp_folder}/{entry_data['audio_name']}"
         tts_method(f"{entry_data['text']}",file_path=audio_path,**convert_param,**kwargs)
 
@@ -136,6 +138,9 @@ class SubToAudio:
 
         audio_length = self._audio_length(audio_path)
         entry_data['audio_length'] = audio_length
+        # Synthesis dominates the run, report it per entry: (entries done, total)
+        if progress_callback is not None:
+          progress_callback(done, len(data))
 
       if shift_mode in shift_set:
         try:
@@ -243,19 +248,36 @@ class SubToAudio:
 
   def _extract_data_srt(self, file_path) -> list:
     subtitle_data = []
-    pattern = r'(\d+)\n([\d:,]+) --> ([\d:,]+)\n(.+?)\n\n'
 
-    with open(file_path, 'r', encoding="utf-8") as file:
+    # utf-8-sig: raw user files (e.g. from generate_audio_only) may start with a BOM
+    with open(file_path, 'r', encoding="utf-8-sig") as file:
         file_content = file.read()
 
-    matches = re.findall(pattern, file_content, re.DOTALL)
+    # Split on blank lines instead of one DOTALL regex over the whole file,
+    # which stays linear on long or malformed subtitle files
+    matches = []
+    for block in file_content.split('\n\n'):
+      block = block.strip('\n')
+      # Slice the number, timing and text out of the block by newline index
+      # rather than splitting it into lines and joining the text back together
+      first = block.find('\n')
+      second = block.find('\n', first + 1)
+      if first < 0 or second < 0:
+        continue
+      entry_number = block[:first].strip()
+      if not entry_number.isdigit():
+        continue
+      start_time, arrow, end_time = block[first + 1:second].partition(' --> ')
+      if not arrow:
+        continue
+      matches.append((entry_number, start_time.strip(), end_time.strip(), block[second + 1:]))
 
     for i, match in enumerate(matches):
       entry_number = int(match[0])
       start_time = match[1]
       end_time = match[2]
       text = match[3].strip()
-      clean_text = re.sub(r'<.*?>', '', text)
+      clean_text = HTML_TAG_PATTERN.sub('', text)
       start_time = self._convert_time_to_intmil(start_time)
       end_time = self._convert_time_to_intmil(end_time)
       if i < len(matches) - 1:
@@ -1,14 +1,238 @@
 from PIL import Image
 import ffmpeg
+import numpy as np
 import os
+import shutil
 import logging
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+import multiprocessing
+import subprocess
+import threading
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
+from utils.helpers import read_image_header
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Encoder workers start from a fresh interpreter; forking a process that runs other
+# threads (GUI pools, TTS) can copy a held lock into the child and deadlock it
+ENCODE_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+# Buffer size for pipes to and from ffmpeg (a 1280x720 yuv420p frame is ~1.4 MB)
+PIPE_BUFFER_SIZE = 1 << 20
+
+# BT.601 limited-range RGB -> YCbCr coefficients, matching libswscale's default
+BT601_MATRIX = np.array([
+    [65.481, 128.553, 24.966],
+    [-37.797, -74.203, 112.0],
+    [112.0, -93.786, -18.214],
+], dtype=np.float32) / 255.0
+
+
+def rgb_to_yuv420p(rgb: np.ndarray) -> bytes:
+    """Convert an HxWx3 uint8 RGB array to a planar yuv420p frame."""
+    height, width, _ = rgb.shape
+    ycc = rgb.astype(np.float32) @ BT601_MATRIX.T
+    ycc += (16.0, 128.0, 128.0)
+    # 2x2 chroma subsampling by averaging each block
+    chroma = ycc[:, :, 1:].reshape(height // 2, 2, width // 2, 2, 2).mean(axis=(1, 3))
+    planes = (ycc[:, :, 0], chroma[:, :, 0], chroma[:, :, 1])
+    return b''.join(
+        np.clip(np.rint(plane), 0, 255).astype(np.uint8).tobytes() for plane in planes
+    )
+
+
+# Common ffmpeg arguments: quiet output, overwrite existing files
+FFMPEG_ARGS = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y']
+
+
+def _run_ffmpeg(args: List[str], input: Optional[bytes] = None) -> None:
+    """Run ffmpeg with the given arguments, raising ffmpeg.Error on failure."""
+    # Only stderr is captured; with -loglevel error it carries nothing but errors
+    result = subprocess.run(
+        [*FFMPEG_ARGS, *args],
+        input=input,
+        stdin=None if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=PIPE_BUFFER_SIZE
+    )
+    if result.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, result.stderr)
+
+
+# Concurrent NVENC sessions allowed on consumer GPUs, and x264 threads per
+# encoder so that cpu_count // X264_THREADS workers fill the CPU
+NVENC_SESSIONS = 3
+X264_THREADS = 2
+
+# Encoder settings: NVENC when a usable GPU is present, libx264 otherwise
+NVENC_CODEC_ARGS = [
+    '-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '19',
+    '-g', '300',
+]
+X264_CODEC_ARGS = [
+    '-c:v', 'libx264', '-crf', '18', '-preset', 'medium',
+    '-threads', str(X264_THREADS),
+    # Caption slideshows are mostly static frames, scene-cut detection is wasted work
+    '-tune', 'stillimage', '-x264-params', 'keyint=300:min-keyint=30:scenecut=0',
+]
+# settings['fast_encode'] (default): identical neighbouring frames leave the
+# motion search nothing to do, so a fast preset loses almost nothing on size
+X264_FAST_CODEC_ARGS = [
+    '-c:v', 'libx264', '-crf', '20', '-preset', 'veryfast',
+    '-threads', str(X264_THREADS),
+    '-tune', 'stillimage', '-x264-params', 'keyint=30:min-keyint=30:scenecut=0',
+]
+
+# (image paths, frame counts, output file, frame rate, codec args)
+BatchJob = Tuple[List[str], List[int], str, int, List[str]]
+
+
+@lru_cache(maxsize=None)
+def has_nvenc() -> bool:
+    """Check once whether h264_nvenc can actually encode on this machine."""
+    try:
+        result = subprocess.run(
+            [*FFMPEG_ARGS, '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+             '-c:v', 'h264_nvenc', '-f', 'null', '-'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
+        )
+        return result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+@lru_cache(maxsize=4096)
+def _image_size_and_mode(image_path: str, mtime_ns: int) -> Tuple[Tuple[int, int], str]:
+    """Read an image's size and mode from its header; mtime_ns keys the cache."""
+    header = read_image_header(image_path)
+    if header:
+        return header[:2], header[2]
+    with Image.open(image_path) as image:  # Lazy open, pixels are not decoded
+        return image.size, image.mode
+
+
+def _pin_to_cores(slot: int, workers: int) -> None:
+    """
+    Restrict the current process, and the ffmpeg it starts, to the slot's share of cores.
+
+    Keeps concurrent encoders from migrating across each other's caches.
+    Best effort: left unpinned where affinity can't be set.
+    """
+    cores = list(range(os.cpu_count() or 1))
+    per_worker = max(1, len(cores) // workers)
+    start = (slot % workers) * per_worker % len(cores)
+    mine = cores[start:start + per_worker]
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, mine)
+        elif os.name == 'nt':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            mask = sum(1 << core for core in mine)
+            kernel32.SetProcessAffinityMask(kernel32.GetCurrentProcess(), ctypes.c_size_t(mask))
+    except (OSError, AttributeError) as e:
+        logging.debug(f"Could not set CPU affinity: {str(e)}")
+
+
+@lru_cache(maxsize=None)
+def aac_encoder() -> str:
+    """Prefer libfdk_aac, which sounds better at the same bitrate, when ffmpeg has it."""
+    try:
+        result = subprocess.run([*FFMPEG_ARGS, '-encoders'], capture_output=True, text=True, timeout=30)
+        if 'libfdk_aac' in result.stdout:
+            return 'libfdk_aac'
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return 'aac'
+
+
+def encode_batch(job: BatchJob, batch_idx: int, workers: int = 0) -> Optional[str]:
+    """
+    Encode one prepared batch (see VideoProcessor.prepare_batch) into a segment.
+
+    Module level so it can run in a ProcessPoolExecutor worker. With workers
+    set, the encoder is pinned to its own share of the CPU cores. Returns the
+    output file, or None if ffmpeg failed.
+    """
+    image_paths, frame_counts, output_file, frame_rate, codec_args = job
+    process = None
+    try:
+        if workers > 1:
+            _pin_to_cores(batch_idx, workers)
+        if len(image_paths) == 1:
+            # A single still needs no piping: ffmpeg decodes it once and the
+            # loop filter repeats the frame, at the same rate as other segments
+            _run_ffmpeg([
+                '-framerate', str(frame_rate), '-i', image_paths[0],
+                '-vf', f'loop=loop={frame_counts[0] - 1}:size=1:start=0',
+                *codec_args, '-pix_fmt', 'yuv420p',
+                '-movflags', '+faststart',
+                output_file
+            ])
+            logging.info(f"Successfully created video segment for batch {batch_idx}")
+            return output_file
+
+        cmd = [
+            *FFMPEG_ARGS,
+            '-f', 'rawvideo', '-pix_fmt', 'yuv420p', '-s', '1280x720', '-r', str(frame_rate),
+            '-i', 'pipe:',
+            *codec_args, '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            output_file
+        ]
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=PIPE_BUFFER_SIZE
+        )
+        VideoProcessor._enlarge_pipe(process.stdin)
+        # Keep converted frames only for images used more than once (e.g. blanks)
+        reused = {path for path, count in Counter(image_paths).items() if count > 1}
+        frames = {}
+        try:
+            for img_path, frame_count in zip(image_paths, frame_counts):
+                frame = frames.get(img_path)
+                if frame is None:
+                    with Image.open(img_path) as image:
+                        frame = rgb_to_yuv420p(np.asarray(image.convert('RGB')))
+                    if img_path in reused:
+                        frames[img_path] = frame
+                for _ in range(frame_count):
+                    process.stdin.write(frame)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early, its stderr is reported below
+
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, stderr)
+        logging.info(f"Successfully created video segment for batch {batch_idx}")
+        return output_file
+    except ffmpeg.Error as e:
+        logging.error(f"FFmpeg error in batch {batch_idx}: {e.stderr.decode() if e.stderr else str(e)}")
+        return None
+    except Exception as e:
+        logging.error(f"FFmpeg error in batch {batch_idx}: {str(e)}")
+        return None
+    finally:
+        if process and process.poll() is None:
+            process.kill()
+            process.wait()
+
+
 class VideoProcessor:
     def __init__(self, temp_manager, settings: dict):
         self.temp_manager = temp_manager
@@ -20,11 +244,22 @@ class VideoProcessor:
         self.image_dir = settings.get('image_dir', os.path.join(self.process_dir, 'images'))
         if not os.path.exists(self.image_dir):
             os.makedirs(self.image_dir)
+        self._probe_cache: dict = {}  # path -> ((mtime, size), ffprobe result)
+        self.blank_png = os.path.join(self.process_dir, 'blank_1280x720.png')
+        self._blank_lock = threading.Lock()
+        self._get_blank_image()  # Written once up front, shared by every invalid frame
+
+    def __enter__(self):
+        return self
 
-    def __del__(self):
-        # Clean up all created temporary directories
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Clean up all created temporary directories."""
         for temp_dir in self.temp_dirs:
             self.cleanup_temp_dir(temp_dir)
+        self.temp_dirs.clear()
 
     def cleanup_temp_dir(self, temp_dir: str):
         try:
@@ -36,44 +271,80 @@ class VideoProcessor:
     def calculate_adjusted_durations(self, frames: List[Dict], audio_duration: float) -> List[Dict]:
         """
         Adjust the duration of each frame to match the audio duration.
-        Ensures minimum duration and rounds to 3 decimal places for millisecond precision.
+        Ensures minimum duration and works in whole milliseconds, so the total
+        matches the audio exactly without floating point drift.
         """
         try:
-            total_frame_duration = sum(frame.get('duration', 0) for frame in frames)
+            durations = np.fromiter((frame.get('duration', 0) for frame in frames),
+                                    dtype=np.float64, count=len(frames))
+            total_frame_duration = durations.sum()
             if total_frame_duration <= 0:
                 logging.error("Total frame duration is zero or negative.")
                 return frames
 
             scaling_factor = audio_duration / total_frame_duration
-            adjusted_frames = []
-            accumulated_duration = 0
-            min_duration = 0.033  # Minimum duration (about 1 frame at 30fps)
-
-            for i, frame in enumerate(frames):
-                adjusted_frame = frame.copy()
-                raw_duration = frame.get('duration', 0) * scaling_factor
-                duration = max(round(raw_duration, 3), min_duration)
-
-                if i == len(frames) - 1:
-                    duration = round(audio_duration - accumulated_duration, 3)
-
-                adjusted_frame['duration'] = duration
-                accumulated_duration += duration
-                adjusted_frames.append(adjusted_frame)
-
-            return adjusted_frames
+            min_duration_ms = 33  # Minimum duration (about 1 frame at 30fps)
+            target_ms = int(audio_duration * 1000 + 0.5)
+
+            # Scale and round half up in place to avoid temporary arrays
+            np.multiply(durations, scaling_factor * 1000, out=durations)
+            durations += 0.5
+            scaled_ms = np.floor(durations, out=durations).astype(np.int64)
+            np.maximum(scaled_ms, min_duration_ms, out=scaled_ms)
+
+            # Spread the remainder a millisecond at a time, longest frames first;
+            # time is only taken back from frames above the minimum
+            delta = target_ms - int(scaled_ms.sum())
+            if delta:
+                sign = 1 if delta > 0 else -1
+                eligible = np.arange(len(scaled_ms))
+                if delta < 0 and (scaled_ms > min_duration_ms).any():
+                    eligible = np.flatnonzero(scaled_ms > min_duration_ms)
+                eligible = eligible[np.argsort(-scaled_ms[eligible], kind='stable')]
+                step, remainder = divmod(abs(delta), len(eligible))
+                scaled_ms[eligible] += sign * step
+                scaled_ms[eligible[:remainder]] += sign
+            scaled = scaled_ms / 1000
+
+            # Frames whose duration is unchanged are passed through without a copy
+            return [
+                frame if frame.get('duration') == duration else {**frame, 'duration': duration}
+                for frame, duration in zip(frames, scaled.tolist())
+            ]
         except Exception as e:
             logging.error(f"Error calculating adjusted durations: {str(e)}")
             return frames
 
+    @staticmethod
+    def _enlarge_pipe(pipe) -> None:
+        """Grow the kernel pipe buffer so a raw frame takes few write() calls (Linux only)."""
+        if fcntl is None or not hasattr(fcntl, 'F_SETPIPE_SZ'):
+            return
+        try:
+            fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+        except OSError as e:
+            # The size is capped by /proc/sys/fs/pipe-max-size, the default buffer still works
+            logging.debug(f"Could not enlarge ffmpeg pipe buffer: {str(e)}")
+
+    @staticmethod
+    def calculate_frame_counts(durations: List[float], frame_rate: int) -> List[int]:
+        """
+        Convert frame durations in seconds to a number of video frames each.
+        Frame boundaries are rounded on the running total so rounding errors
+        do not accumulate over the batch; every image gets at least one frame.
+        """
+        boundaries = np.round(np.cumsum(durations, dtype=np.float64) * frame_rate).astype(np.int64)
+        counts = np.diff(boundaries, prepend=0)
+        return np.maximum(counts, 1).tolist()
+
     def validate_image(self, image_path: str) -> bool:
         """Validate image dimensions and color mode."""
         try:
-            image = Image.open(image_path)
-            if image.size != (1280, 720):
+            size, mode = _image_size_and_mode(image_path, os.stat(image_path).st_mtime_ns)
+            if size != (1280, 720):
                 logging.error("Invalid image dimensions.")
                 return False
-            if image.mode != 'RGB':
+            if mode != 'RGB':
                 logging.error("Invalid color mode.")
                 return False
             return True
@@ -83,12 +354,33 @@ class VideoProcessor:
 
     def validate_and_prepare_image(self, img_path: str, process_dir: str, batch_idx: int) -> str:
         """Validate an image or replace it with a blank image if invalid."""
+        if img_path and self.settings.get('skip_validation'):
+            # Images come from our own generator, so the colour mode is trusted. The size is
+            # still checked from the cached header: the encoder pipe declares 1280x720 frames
+            # and segments are joined with -c copy, so any other size would corrupt the video
+            try:
+                size, _ = _image_size_and_mode(img_path, os.stat(img_path).st_mtime_ns)
+                if size == (1280, 720):
+                    return img_path
+                logging.error(f"Invalid image dimensions {size}: {img_path}. Replacing with a blank image.")
+            except Exception as e:
+                logging.error(f"Error reading image {img_path}: {str(e)}. Replacing with a blank image.")
+            return self._get_blank_image()
         if not img_path or not os.path.exists(img_path) or not self.validate_image(img_path):
             logging.error(f"Invalid image: {img_path}. Replacing with a blank image.")
-            img_path = os.path.join(process_dir, f"blank_{batch_idx:04d}.png")
-            Image.new('RGB', (1280, 720), (255, 255, 255)).save(img_path)
+            img_path = self._get_blank_image()
         return img_path
 
+    def _get_blank_image(self) -> str:
+        """Return the shared blank placeholder image, creating it on first use."""
+        with self._blank_lock:
+            # Re-created if the temp directories were cleaned since the last run
+            if not os.path.exists(self.blank_png):
+                Image.new('RGB', (1280, 720), (255, 255, 255)).save(
+                    self.blank_png, optimize=False, compress_level=1
+                )
+        return self.blank_png
+
     def process_images(self, images, output_path, audio_input: str = None):
         try:
             if audio_input:
@@ -96,196 +388,234 @@ class VideoProcessor:
                 if audio_duration > 0:
                     images = self.calculate_adjusted_durations(images, audio_duration)
 
-            batch_size = max(len(images) // 10, 50)
+            # One batch per encoder so each worker starts a single long-lived
+            # ffmpeg instead of paying encoder startup for many short segments
+            workers = self._encode_workers()
+            batch_size = max(-(-len(images) // workers), 50)
             batches = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
             segments = [None] * len(batches)
+            video_duration = 0.0  # Exact length of the encoded segments, from their frame counts
 
-            with ThreadPoolExecutor(max_workers=4) as executor:
+            # Validation runs here; the frame marshalling and ffmpeg piping run in
+            # worker processes so they don't compete for the GIL.
+            jobs = [self.prepare_batch(batch, idx) for idx, batch in enumerate(batches)]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ENCODE_MP_CONTEXT) as executor:
                 future_map = {
-                    executor.submit(self.process_batch, batch, idx): idx
-                    for idx, batch in enumerate(batches)
+                    executor.submit(encode_batch, job, idx, workers): idx
+                    for idx, job in enumerate(jobs) if job is not None
                 }
 
                 for future in as_completed(future_map):
                     batch_idx = future_map[future]
                     result = future.result()
-                    if result:
+                    if result and self.is_valid_video(result):
                         segments[batch_idx] = result
+                        _, frame_counts, _, frame_rate, _ = jobs[batch_idx]
+                        video_duration += sum(frame_counts) / frame_rate
                         logging.info(f"Processed batch {batch_idx}")
                     else:
                         logging.error(f"Failed batch {batch_idx}")
 
-            valid_segments = self._get_ordered_segments(segments)
+            valid_segments = [s for s in segments if s]  # Already in batch order
             if not valid_segments:
                 logging.error("No valid segments for final video")
                 return False
 
-            return self.combine_segments(valid_segments, output_path, audio_input)
+            return self.combine_segments(valid_segments, output_path, audio_input, video_duration=video_duration)
 
         except Exception as e:
             logging.error(f"Video processing failed: {str(e)}")
             return False
 
-    def process_batch(self, batch: List[Dict], batch_idx: int) -> Optional[str]:
-        process_dir = None
-        list_file = None
-        try:
-            if not batch:
-                logging.warning(f"Skipping empty batch {batch_idx}")
-                return None
+    @staticmethod
+    def _encode_workers() -> int:
+        """Number of batch encoders to run at once for the available encoder."""
+        if has_nvenc():
+            return NVENC_SESSIONS
+        return max(1, (os.cpu_count() or 4) // X264_THREADS)
 
-            process_dir = self.temp_manager.create_process_dir()
-            list_file = os.path.join(process_dir, f"input_{batch_idx}.txt")
-            output_file = os.path.join(process_dir, f"batch_{batch_idx:04d}.mp4")
+    def _x264_codec_args(self) -> List[str]:
+        return X264_FAST_CODEC_ARGS if self.settings.get('fast_encode', True) else X264_CODEC_ARGS
 
-            with open(list_file, 'w', encoding='utf-8') as f:
-                for img in batch:
-                    img_path = self.validate_and_prepare_image(img.get('path'), process_dir, batch_idx)
-                    duration = img.get('duration', 1.0)
-                    f.write(f"file '{os.path.abspath(img_path)}'\n")
-                    f.write(f"duration {duration:.3f}\n")
+    def prepare_batch(self, batch: List[Dict], batch_idx: int) -> Optional[BatchJob]:
+        """
+        Validate a batch and build the picklable job consumed by encode_batch.
 
-            if not os.path.exists(list_file) or os.path.getsize(list_file) == 0:
-                logging.error(f"Empty list file for batch {batch_idx}")
-                return None
+        Returns (image paths, frame counts, output file, frame rate, codec args),
+        or None for an empty batch.
+        """
+        if not batch:
+            logging.warning(f"Skipping empty batch {batch_idx}")
+            return None
 
-            frame_rate = 30
-            try:
-                cmd = (
-                    ffmpeg
-                    .input(list_file, format='concat', safe=0)
-                    .output(output_file,
-                            vsync='cfr',
-                            vcodec='libx264',
-                            pix_fmt='yuv420p',
-                            crf=18,
-                            r=frame_rate,
-                            preset='medium',
-                            movflags='+faststart')
-                )
-                cmd.overwrite_output().run(capture_stdout=True, capture_stderr=True)
-                logging.info(f"Successfully created video segment for batch {batch_idx}")
-            except ffmpeg.Error as e:
-                logging.error(f"FFmpeg error in batch {batch_idx}: {e.stderr.decode() if e.stderr else str(e)}")
-                return None
+        process_dir = self.temp_manager.create_process_dir()
+        output_file = os.path.join(process_dir, f"batch_{batch_idx:04d}.mp4")
+
+        frame_rate = 30
+        frame_counts = self.calculate_frame_counts(
+            [img.get('duration', 1.0) for img in batch], frame_rate
+        )
+        image_paths = []
+        merged_counts = []
+        for img, frame_count in zip(batch, frame_counts):
+            img_path = self.validate_and_prepare_image(img.get('path'), process_dir, batch_idx)
+            # Consecutive repeats of an image (e.g. runs of blanks) become one entry
+            if image_paths and image_paths[-1] == img_path:
+                merged_counts[-1] += frame_count
+            else:
+                image_paths.append(img_path)
+                merged_counts.append(frame_count)
+        frame_counts = merged_counts
+        codec_args = NVENC_CODEC_ARGS if has_nvenc() else self._x264_codec_args()
+        return image_paths, frame_counts, output_file, frame_rate, codec_args
+
+    def process_batch(self, batch: List[Dict], batch_idx: int) -> Optional[str]:
+        """
+        Encode a batch of images into a video segment.
 
-            return output_file if self.is_valid_video(output_file) else None
+        Each image is decoded and converted to a raw yuv420p frame once, which
+        is written to the ffmpeg encoder through stdin as many times as its duration requires,
+        so ffmpeg never has to open or decode the image files itself.
+        """
+        try:
+            job = self.prepare_batch(batch, batch_idx)
+            if job is None:
+                return None
+            output_file = encode_batch(job, batch_idx)
+            return output_file if output_file and self.is_valid_video(output_file) else None
         except Exception as e:
             logging.error(f"FFmpeg error in batch {batch_idx}: {str(e)}")
             return None
-        finally:
-            if list_file and os.path.exists(list_file):
-                try:
-                    os.remove(list_file)
-                except Exception as e:
-                    logging.warning(f"Error cleaning up list file: {str(e)}")
-
-    def _get_ordered_segments(self, segments: list) -> list:
-        try:
-            valid = [s for s in segments if s is not None]
-            valid.sort(key=lambda x: int(os.path.basename(x).split('_')[1].split('.')[0]))
-            return valid
-        except Exception as e:
-            logging.error(f"Segment ordering failed: {str(e)}")
-            return []
-    
-    def combine_segments(self, segments: List[str], output_path: str, audio_input: str = None) -> bool:
-        """Combine video segments with background music handling and explicit stream mapping."""
-        concat_list = None
+
+    def combine_segments(self, segments: List[str], output_path: str, audio_input: str = None,
+                         video_duration: Optional[float] = None) -> bool:
+        """
+        Combine video segments with background music handling and explicit stream mapping.
+
+        Segments must be given in playback order. video_duration is the total
+        length of the segments when the caller already knows it; otherwise it
+        is taken from the segment probes.
+        """
         try:
-            # Ensure segments are ordered correctly
-            segments = self._get_ordered_segments(segments)
-            
             # Validate segments
-            valid_segments = [s for s in segments if os.path.exists(s) and self.is_valid_video(s)]
+            segments = [s for s in segments if os.path.exists(s)]
+            probes = self._probe_many(segments)
+            valid_segments = [s for s in segments if self._has_stream(probes[s], 'video')]
             if not valid_segments:
                 logging.error("No valid video segments found for combining")
                 return False
 
-            # Create concat list
-            concat_list = os.path.join(self.temp_manager.process_dir, "final_list.txt")
-            with open(concat_list, 'w', encoding='utf-8') as f:
-                for seg in valid_segments:
-                    f.write(f"file '{os.path.abspath(seg)}'\n")
-
-            video_input = ffmpeg.input(concat_list, format='concat', safe=0, fflags='+genpts')
-            
-            # Temporary output path for the unsynced video
-            unsynced_video_path = os.path.join(self.temp_manager.process_dir, "unsynced_video.mp4")
+            # The concat list is fed to ffmpeg on stdin rather than written to a file.
+            # Entries need the file: protocol, or they resolve relative to pipe:,
+            # and quotes in paths are escaped as the concat demuxer expects ('\'')
+            lines = [
+                "file 'file:{}'".format(os.path.abspath(seg).replace("'", "'\\''"))
+                for seg in valid_segments
+            ]
+            concat_list = ('\n'.join(lines) + '\n').encode('utf-8')
+
+            video_input = [
+                '-f', 'concat', '-safe', '0', '-protocol_whitelist', 'file,pipe',
+                '-fflags', '+genpts', '-i', 'pipe:0'
+            ]
+
+            # Segments normally share codec parameters and the video track is
+            # copied as-is; mismatched segments (e.g. from different encoders)
+            # would produce a broken stream, so those are re-encoded instead
+            if self._segments_compatible([probes[s] for s in valid_segments]):
+                video_codec = ['-c:v', 'copy']
+            else:
+                logging.warning("Video segments have differing encoder parameters, re-encoding")
+                video_codec = [*self._x264_codec_args(), '-pix_fmt', 'yuv420p']
 
             # Handle background music
             if audio_input:
                 if not self.is_valid_audio(audio_input):
                     logging.error("Audio input is not a valid audio file")
                     return False
-                audio_stream = ffmpeg.input(audio_input)
-                video_stream = video_input['v']
-                audio_stream = audio_stream['a']
-                (
-                    ffmpeg
-                    .concat(
-                        video_stream,
-                        audio_stream,
-                        v=1,
-                        a=1
-                    )
-                    .output(
-                        unsynced_video_path,
-                        vcodec='libx264',
-                        acodec='aac',
-                        audio_bitrate='192k',
-                        strict='experimental',
-                        movflags='+faststart',
-                        r=30  # Force frame rate to 30 FPS for sync stability
-                    )
-                    .overwrite_output()
-                    .run(quiet=True)
-                )
+                if video_duration is None:
+                    # Segment probes are cached from validation
+                    video_duration = sum(float(probes[seg]['format']['duration']) for seg in valid_segments)
+                audio_duration = self.get_audio_duration(audio_input)
+                atempo_args = self._atempo_args(video_duration, audio_duration)
+                # The background music is synced in the same pass, and only
+                # encoded when it has to be retimed or isn't AAC already
+                _run_ffmpeg([
+                    *video_input,
+                    '-i', audio_input,
+                    '-map', '0:v', '-map', '1:a',
+                    *atempo_args,
+                    *video_codec, *self._audio_codec_args(audio_input, atempo_args),
+                    '-movflags', '+faststart',
+                    output_path
+                ], input=concat_list)
             else:
                 # If no background music, check if segments have audio
-                has_audio = any(self.has_audio_stream(seg) for seg in valid_segments)
+                has_audio = any(self._has_stream(probes[s], 'audio') for s in valid_segments)
                 if has_audio:
-                    # Re-encode video and audio to ensure sync
-                    (
-                        ffmpeg
-                        .output(video_input, unsynced_video_path, vcodec='libx264', acodec='aac', r=30, audio_bitrate='192k')
-                        .overwrite_output()
-                        .run()
-                    )
+                    # Stream copy the segment audio
+                    _run_ffmpeg([*video_input, *video_codec, '-c:a', 'copy', '-movflags', '+faststart', output_path],
+                                input=concat_list)
                 else:
                     # No audio in segments and no background music
-                    (
-                        ffmpeg
-                        .output(video_input, unsynced_video_path, vcodec='libx264', an=None, r=30)
-                        .overwrite_output()
-                        .run()
-                    )
-
-            # Sync the video with the audio (if audio is provided)
-            if audio_input:
-                if not self.sync_audio_with_video(unsynced_video_path, audio_input, output_path):
-                    logging.error("Failed to sync video with audio")
-                    return False
-            else:
-                os.replace(unsynced_video_path, output_path)  # No audio, just rename the video
+                    _run_ffmpeg([*video_input, *video_codec, '-an', '-movflags', '+faststart', output_path],
+                                input=concat_list)
 
             return True
         except ffmpeg.Error as e:
             logging.error(f"FFmpeg concatenation error: {e.stderr.decode().strip()}")
             return False
-        finally:
-            if concat_list and os.path.exists(concat_list):
-                try:
-                    os.remove(concat_list)
-                except Exception as e:
-                    logging.warning(f"Error cleaning up concat list: {str(e)}")
     
+    def _probe(self, file_path: str) -> dict:
+        """Run ffprobe on a file, reusing the result while the file is unchanged."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return ffmpeg.probe(file_path)
+
+        # One entry per path, replaced when the file's mtime or size changes
+        stamp = (stat.st_mtime, stat.st_size)
+        cached = self._probe_cache.get(file_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        probe = ffmpeg.probe(file_path)
+        self._probe_cache[file_path] = (stamp, probe)
+        return probe
+
+    def _probe_many(self, paths: List[str]) -> Dict[str, Optional[dict]]:
+        """Probe several files concurrently, mapping each path to its probe or None."""
+        def probe(path):
+            try:
+                return self._probe(path)
+            except Exception as e:
+                logger.error(f"Invalid video file: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            return dict(zip(paths, executor.map(probe, paths)))
+
+    @staticmethod
+    def _segments_compatible(probes: List[dict]) -> bool:
+        """Check that all segments' video streams can be joined by stream copy."""
+        keys = ('codec_name', 'profile', 'level', 'width', 'height', 'pix_fmt', 'r_frame_rate')
+        params = {
+            tuple(stream.get(key) for key in keys)
+            for probe in probes
+            for stream in probe.get('streams', [])
+            if stream.get('codec_type') == 'video'
+        }
+        return len(params) <= 1
+
+    @staticmethod
+    def _has_stream(probe: Optional[dict], codec_type: str) -> bool:
+        return bool(probe) and any(stream['codec_type'] == codec_type for stream in probe.get('streams', []))
+
     def is_valid_audio(self, file_path: str) -> bool:
         if not os.path.exists(file_path):
             logger.error(f"Audio file not found: {file_path}")
             return False
         try:
-            probe = ffmpeg.probe(file_path)
+            probe = self._probe(file_path)
             return any(stream['codec_type'] == 'audio' for stream in probe['streams'])
         except Exception as e:
             logger.error(f"Invalid audio file: {str(e)}")
@@ -294,7 +624,7 @@ class VideoProcessor:
     def is_valid_video(self, file_path: str) -> bool:
         """Check if file is a valid video."""
         try:
-            probe = ffmpeg.probe(file_path)
+            probe = self._probe(file_path)
             return any(stream['codec_type'] == 'video' for stream in probe['streams'])
         except Exception as e:
             logger.error(f"Invalid video file: {str(e)}")
@@ -303,44 +633,65 @@ class VideoProcessor:
     def has_audio_stream(self, file_path: str) -> bool:
         """Check if video file contains an audio stream."""
         try:
-            probe = ffmpeg.probe(file_path)
+            probe = self._probe(file_path)
             return any(stream['codec_type'] == 'audio' for stream in probe.get('streams', []))
         except Exception as e:
             logging.error(f"Error checking audio for {file_path}: {str(e)}")
             return False
         
-    def sync_audio_with_video(self, video_path: str, audio_path: str, output_path: str) -> bool:
+    @staticmethod
+    def _atempo_args(video_duration: float, audio_duration: float) -> List[str]:
+        """Return the audio filter arguments that stretch the audio to the video length."""
+        # If the video and audio durations are the same, no need to sync
+        if audio_duration <= 0 or abs(video_duration - audio_duration) < 0.1:  # Allow a small tolerance
+            logging.info("Video and audio are already in sync.")
+            return []
+        # atempo > 1 speeds the audio up, so the factor is audio length over video length
+        speed_factor = audio_duration / video_duration
+        logging.info(f"Video and audio lengths differ. Adjusting audio speed by factor {speed_factor:.2f}.")
+        return ['-filter:a', f'atempo={speed_factor}']
+
+    def _audio_codec_args(self, audio_path: str, atempo_args: List[str]) -> List[str]:
+        """Copy AAC audio that needs no retiming, otherwise encode it."""
+        if not atempo_args:
+            try:
+                probe = self._probe(audio_path)
+                if any(stream.get('codec_type') == 'audio' and stream.get('codec_name') == 'aac'
+                       for stream in probe.get('streams', [])):
+                    return ['-c:a', 'copy']
+            except Exception as e:
+                logging.warning(f"Could not probe audio codec: {str(e)}")
+        return ['-c:a', aac_encoder(), '-b:a', '192k']
+
+    def sync_audio_with_video(self, video_path: str, audio_path: str, output_path: str,
+                              video_duration: Optional[float] = None) -> bool:
         """
         Synchronize the audio with the video using ffmpeg.
         If the video and audio are out of sync, adjust the audio speed to match the video.
+        Pass video_duration when it is already known to skip probing the video.
         """
         try:
             # Probe the video and audio to get their durations
-            video_info = ffmpeg.probe(video_path)
-            audio_info = ffmpeg.probe(audio_path)
-
-            video_duration = float(video_info['format']['duration'])
-            audio_duration = float(audio_info['format']['duration'])
-
-            # If the video and audio durations are the same, no need to sync
-            if abs(video_duration - audio_duration) < 0.1:  # Allow a small tolerance
-                logging.info("Video and audio are already in sync.")
-                os.replace(video_path, output_path)  # Just rename the video
+            if video_duration is None:
+                video_duration = float(self._probe(video_path)['format']['duration'])
+            audio_duration = float(self._probe(audio_path)['format']['duration'])
+
+            atempo_args = self._atempo_args(video_duration, audio_duration)
+            if not atempo_args:
+                shutil.move(video_path, output_path)  # Just move the video, may cross filesystems
+                self._probe_cache.pop(video_path, None)
                 return True
             else:
-                speed_factor = video_duration / audio_duration
-                logging.info(f"Video is shorter than audio. Adjusting audio speed by factor {speed_factor:.2f}.")
-                video_stream = ffmpeg.input(video_path)['v']
-                audio_stream = (
-                    ffmpeg.input(audio_path)['a']
-                    .filter('atempo', speed_factor)
-                )
-                (
-                    ffmpeg.concat(video_stream, audio_stream, v=1, a=1)
-                    .output(output_path, acodec='aac', audio_bitrate='192k')
-                    .overwrite_output()
-                    .run(quiet=True)
-                ) 
+                # Only the audio tempo changes, the video track is copied untouched
+                _run_ffmpeg([
+                    '-i', video_path,
+                    '-i', audio_path,
+                    '-map', '0:v', '-map', '1:a',
+                    *atempo_args,
+                    '-c:v', 'copy', *self._audio_codec_args(audio_path, atempo_args),
+                    '-movflags', '+faststart',
+                    output_path
+                ])
 
                 return True
         except ffmpeg.Error as e:
@@ -355,7 +706,7 @@ class VideoProcessor:
         Get the duration of the audio file in seconds.
         """
         try:
-            probe = ffmpeg.probe(audio_path)
+            probe = self._probe(audio_path)
             return float(probe['format']['duration'])
         except Exception as e:
             logging.error(f"Error getting audio duration: {str(e)}")
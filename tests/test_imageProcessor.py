@@ -74,5 +74,46 @@ class TestImageGenerator(unittest.TestCase):
         
         self.assertEqual(len(result), 0)
 
+    @patch('processors.image_generator.ImageGenerator._save_image')
+    @patch('processors.image_generator.ImageGenerator._validate_image', return_value=True)
+    def test_generate_images_reuses_identical_renders(self, mock_validate_image, mock_save_image):
+        entries = [
+            {'start_time': 0, 'end_time': 5, 'text': '...'},
+            {'start_time': 5, 'end_time': 10, 'text': 'Hello World'},
+            {'start_time': 10, 'end_time': 15, 'text': '...'}
+        ]
+
+        result = self.image_generator.generate_images(entries)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.image_generator._render_subtitle_image.cache_info().hits, 1)
+        self.assertIs(mock_save_image.call_args_list[0][0][0], mock_save_image.call_args_list[2][0][0])
+
+        self.image_generator.settings['text_color'] = '#FF0000'
+        self.image_generator.generate_images(entries[:1])
+        self.assertEqual(self.image_generator._render_subtitle_image.cache_info().hits, 1)
+
+    @patch('processors.image_generator.ImageGenerator._save_image')
+    @patch('processors.image_generator.ImageGenerator._validate_image', return_value=True)
+    def test_custom_font_change_rerenders(self, mock_validate_image, mock_save_image):
+        entries = [{'start_time': 0, 'end_time': 5, 'text': 'Hello'}]
+        self.image_generator.generate_images(entries)
+
+        self.image_generator.settings['custom_font'] = '/nonexistent/font.ttf'
+        self.image_generator.generate_images(entries)
+
+        self.assertEqual(self.image_generator._render_subtitle_image.cache_info().hits, 0)
+        self.assertEqual(len(self.image_generator.font_cache), 2)
+
+    def test_clear_caches(self):
+        self.image_generator.get_font('Arial', 24, False, False)
+        self.image_generator._render_subtitle_image('Hello', self.image_generator._render_settings())
+
+        self.image_generator.clear_caches()
+
+        self.assertEqual(self.image_generator.font_cache, {})
+        self.assertEqual(self.image_generator._render_subtitle_image.cache_info().currsize, 0)
+        self.assertEqual(self.image_generator._base_template.cache_info().currsize, 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,9 +1,10 @@
 import unittest
 import sys
 import os
+import tempfile
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from unittest.mock import patch, mock_open
-from processors.srt_parser import SRTParser
+from processors.srt_parser import SRTParser, adjust_srt
 
 class TestSRTParser(unittest.TestCase):
     def setUp(self):
@@ -28,6 +29,12 @@ class TestSRTParser(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]['text'], "Hello")
 
+    def test_parse_time(self):
+        self.assertAlmostEqual(self.parser.parse_time("01:02:03,450"), 3723.45)
+        self.assertAlmostEqual(self.parser.parse_time("02:03.5"), 123.5)
+        self.assertAlmostEqual(self.parser.parse_time("\ufeff00:00:07"), 7.0)
+        self.assertEqual(self.parser.parse_time("invalid"), 0.0)
+
     @patch("builtins.open", new_callable=mock_open, read_data="")
     def test_parse_empty_file(self, mock_file):
         result = self.parser.parse("dummy_path.srt")
@@ -40,5 +47,21 @@ class TestSRTParser(unittest.TestCase):
         self.assertEqual(result[0]['text'], "<b>Hello</b>")
         self.assertEqual(result[1]['text'], "<i>World</i>")
 
+    def test_adjust_srt(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "in.srt")
+            output_path = os.path.join(temp_dir, "out.srt")
+            with open(input_path, "w", encoding="utf-8", newline="") as f:
+                f.write("1\r\n00:00:01,000 --> 00:00:02,500\r\nHello\r\n\r\n\r\n2\r\n00:00:03,000 --> 00:00:04,000\r\nWorld\r\n")
+
+            self.assertEqual(adjust_srt(input_path, -1500, output_path), output_path)
+            with open(output_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "1\n00:00:00,000 --> 00:00:01,000\nHello\n\n"
+                                           "2\n00:00:01,500 --> 00:00:02,500\nWorld\n\n")
+
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write("not a subtitle\n")
+            self.assertEqual(adjust_srt(input_path, 100, output_path), input_path)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,27 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from processors.sub2audio import SubToAudio
+
+class TestSubToAudio(unittest.TestCase):
+    def setUp(self):
+        # Only the SRT reader is tested, so no TTS model is loaded
+        self.sub_to_audio = SubToAudio.__new__(SubToAudio)
+
+    def test_extract_data_srt_with_bom(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            srt_path = os.path.join(temp_dir, "bom.srt")
+            with open(srt_path, "w", encoding="utf-8-sig") as f:
+                f.write("1\n00:00:01,000 --> 00:00:02,000\nHello\n\n2\n00:00:03,000 --> 00:00:04,000\n<i>World</i>\n")
+
+            result = self.sub_to_audio._extract_data_srt(srt_path)
+
+        self.assertEqual([entry['text'] for entry in result], ["Hello", "World"])
+        self.assertEqual(result[0]['entry_number'], 1)
+        self.assertEqual(result[0]['start_time'], 1000)
+        self.assertEqual(result[0]['sub_time'], 2000)
+
+if __name__ == "__main__":
+    unittest.main()
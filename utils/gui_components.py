@@ -1,9 +1,13 @@
 # Standard library imports
 import os
+import re
 import sys
 import logging
+import importlib
 import threading
-import subprocess
+import queue
+from collections import OrderedDict
+from functools import lru_cache, partial
 from typing import List
 
 # Third-party imports
@@ -12,15 +16,75 @@ from tkinter import ttk, filedialog, messagebox, colorchooser
 from PIL import Image, ImageTk, ImageFont, ImageDraw
 import webbrowser
 import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # Local application imports
-from processors.sub2audio import SubToAudio
 from processors.image_generator import ImageGenerator
-from processors.srt_parser import SRTParser
-from processors.video_processor import VideoProcessor
+from processors.srt_parser import SRTParser, adjust_srt
+from processors.video_processor import VideoProcessor, encode_batch, ENCODE_MP_CONTEXT
 from utils.style_parser import StyleParser
-from utils.helpers import TempFileManager
+from utils.helpers import TempFileManager, read_image_header
+
+# Modules that pull in torch/Coqui TTS are imported on first use, so the window appears first
+_LAZY_MODULES = {}
+
+# Shared pool for short background jobs (model scans, previews, output prompts) kept off the Tk event loop
+_IO_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix='gui-io')
+
+# How often queued UI updates from worker threads are applied, in ms
+UI_POLL_MS = 50
+
+# Rendered previews kept per style, so reopening an unchanged preview skips rendering
+PREVIEW_CACHE_SIZE = 8
+
+def _lazy(name):
+    """Import a module on first use and cache it"""
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        module = _LAZY_MODULES[name] = importlib.import_module(name)
+    return module
+
+# TTS engines kept loaded: the model-less one that lists models, and only the selected model,
+# in separate one-entry caches so selecting a new model drops the previous model's weights
+_TTS_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _load_tts_lister():
+    return _lazy('processors.sub2audio').SubToAudio()
+
+@lru_cache(maxsize=1)
+def _load_sub_to_audio(model_name):
+    return _lazy('processors.sub2audio').SubToAudio(model_name=model_name)
+
+def _get_sub_to_audio(model_name=None):
+    """Return the SubToAudio for a model, constructing it only the first time it is requested"""
+    # Serialized so overlapping requests for the same model don't load its weights twice
+    with _TTS_LOCK:
+        if model_name is None:
+            return _load_tts_lister()
+        return _load_sub_to_audio(model_name)
+
+def _validate_one(path, expected_dims):
+    """Check one image file against (width, height), returning an error message or None when it is valid"""
+    try:
+        if not os.path.exists(path):
+            return f"Missing file: {path}"
+
+        # Happy path reads only the PNG/JPEG header; full verification is kept to report what is wrong
+        header = read_image_header(path)
+        if header and header[:2] == expected_dims:
+            return None
+
+        with Image.open(path) as img:
+            img.verify()
+            if img.size != expected_dims:
+                return (
+                    f"Dimension mismatch in {os.path.basename(path)}: "
+                    f"Expected {expected_dims}, Got {img.size}"
+                )
+    except Exception as e:
+        return f"Invalid image {os.path.basename(path)}: {str(e)}"
+    return None
 
 class GUIComponents:
     def __init__(self, root, app):
@@ -42,15 +106,14 @@ class GUIComponents:
         # Initialize the application state
         self.initialize_app()
         
-        # Setup UI styles
+        # Setup UI styles, the theme is applied once here and setup_styles only configures it
+        self.style = ttk.Style(self.root)
+        self.style.theme_use('clam')
         self.setup_styles()
         
         # Create widgets
         self.create_widgets()
         
-        # Load TTS models after UI is ready
-        self.root.after(100, self.load_tts_models)
-        
         # Update settings to ensure consistency
         self.update_settings()
 
@@ -63,30 +126,49 @@ class GUIComponents:
 
     def get_current_settings(self) -> dict:
         """Safely get current settings with null checks"""
-        settings = {
-            'text_color': self.text_color_var.get(),
-            'bg_color': self.bg_color_var.get(),
-            'font_size': self.font_size_var.get(),
-            'text_border': self.border_var.get(),
-            'text_shadow': self.shadow_var.get(),
+        # Tk variable reads go through Tcl, so they are only re-read after a variable changes
+        if self._settings_dirty:
+            self._tk_settings = {
+                'text_color': self.text_color_var.get(),
+                'bg_color': self.bg_color_var.get(),
+                'font_size': self.font_size_var.get(),
+                'text_border': self.border_var.get(),
+                'text_shadow': self.shadow_var.get(),
+                'tts_model': self.model_var.get(),
+                'user_value': self._safe_int_get(self.user_value_var, 0),
+                # The language combobox writes through to language_var
+                'tts_language': self.language_var.get()
+            }
+            self._settings_dirty = False
+
+        settings = dict(self._tk_settings)
+        settings.update({
             'background_image': self.background_image_path,
             'background_music': self.background_music_path,
             'custom_font': self.custom_font_path,
             'margin': 20,
             'speed_factor': 1.0,
             'batch_size': 50,
-            'tts_model': self.model_var.get(),
-            'reference_audio': self.speaker_ref_path,
-            'user_value': self._safe_int_get(self.user_value_var, 0)
-        }
-        # Safe language combo handling
-        if hasattr(self, 'lang_combo') and self.lang_combo:
-            settings['tts_language'] = self.lang_combo.get()
-        else:
-            settings['tts_language'] = self.language_var.get()  # Use the StringVar value
-        
+            'reference_audio': self.speaker_ref_path
+        })
         return settings    
 
+    def _debounce(self, name: str, ms: int, fn):
+        """Call fn after ms without another call for the same name, dropping the pending one"""
+        token = self._debounce_tokens.get(name)
+        if token is not None:
+            self.root.after_cancel(token)
+        self._debounce_tokens[name] = self.root.after(ms, fn)
+
+    def _on_font_size_changed(self, *args):
+        """Font size trace: push the new size once the slider settles"""
+        if not self._batch_updates:
+            self._debounce('font_size', 120, self.update_settings)
+
+    def _mark_settings_dirty(self, *args):
+        """Tk variable trace: re-read the variables on the next get_current_settings"""
+        self._settings_dirty = True
+
     def initialize_app(self):
         """Initialize all application state and components in correct order"""
         # 1. Initialize Tkinter variables first
@@ -105,10 +187,23 @@ class GUIComponents:
     
         self.lang_combo = None
         self.language_var = tk.StringVar(value="fr")
+        self.tts_soundtrack_var = tk.BooleanVar(value=False)
+
+        self._settings_dirty = True
+        self._tk_settings = {}
+        for var in (self.text_color_var, self.bg_color_var, self.font_size_var, self.border_var,
+                    self.shadow_var, self.user_value_var, self.model_var, self.language_var):
+            var.trace_add('write', self._mark_settings_dirty)
+        # The font size Scale writes on every pixel of a drag, only push the size once it settles
+        self._debounce_tokens = {}
+        self._batch_updates = False
+        self.font_size_var.trace_add('write', self._on_font_size_changed)
 
         self.settings = {
             'batch_size': 50,  # Default value
-            'expected_dimensions': self.expected_dimensions
+            'expected_dimensions': self.expected_dimensions,
+            'use_ram_disk': False,  # Keep intermediate video files on /dev/shm (Linux)
+            'prewarm_tts': True  # Import Coqui TTS in the background once the window is up
         }
 
         # 2. Initialize file paths
@@ -117,38 +212,12 @@ class GUIComponents:
         self.custom_font_path = None
         self.srt_path = None
 
-        # 3. Initialize core components with default settings
-        self.temp_manager = TempFileManager()
+        # 3. Initialize core components that do not depend on settings
+        self.temp_manager = TempFileManager(use_ram_disk=self.settings['use_ram_disk'])
         self.style_parser = StyleParser()
         self.srt_parser = SRTParser()
-        self.image_generator = ImageGenerator(
-            self.temp_manager, 
-            self.style_parser,
-            {
-            'text_color': '#FFFFFF',
-            'bg_color': '#000000', 
-            'font_size': 24,
-            'text_border': True,
-            'text_shadow': False,
-            'background_image': None,
-            'custom_font': None,
-            'margin': 20,
-            'expected_dimensions': self.expected_dimensions
-            }
-        )
 
-        self.video_processor = VideoProcessor(
-            self.temp_manager,
-            {
-            'batch_size': 50,
-            'background_music': None,
-            'expected_dimensions': self.expected_dimensions,
-            'speed_factor': 1.0
-            }
-        )
-        # 4. Get initial settings from variables
-        initial_settings = self.get_current_settings()
-        # Load or create initial settings
+        # 4. Load or create initial settings
         self.settings = {
             'batch_size': 50,
             'text_color': '#FFFFFF',
@@ -164,10 +233,13 @@ class GUIComponents:
             'tts_model': None,
             'tts_language': 'fr',
             'expected_dimensions': self.expected_dimensions,
-            'user_value': 0
+            'user_value': 0,
+            'use_ram_disk': self.settings['use_ram_disk'],
+            'prewarm_tts': self.settings['prewarm_tts']
         }
 
-        # Apply settings to variables
+        # Apply settings to variables, update_settings runs once at the end instead of per variable
+        self._batch_updates = True
         self.text_color_var.set(self.settings['text_color'])
         self.bg_color_var.set(self.settings['bg_color']) 
         self.font_size_var.set(self.settings['font_size'])
@@ -175,45 +247,38 @@ class GUIComponents:
         self.shadow_var.set(self.settings['text_shadow'])
         self.language_var.set(self.settings['tts_language'])
         self.user_value_var.set(str(self.settings['user_value']))
+        self._batch_updates = False
 
-        # Setup style
-        style = ttk.Style()
-        style.theme_use('clam')
-
-        # Configure colors
-        style.configure('TFrame', background='#F0F0F0')
-        style.configure('TButton',
-            background='#4A90E2',
-            foreground='black', 
-            padding=5,
-            font=('Helvetica', 10))
-        style.configure('TLabel', 
-            background='#F0F0F0',
-            font=('Helvetica', 10))
-        style.configure('Header.TLabel',
-            background='#4A90E2',
-            foreground='white',
-            font=('Helvetica', 12, 'bold'))
-        # 5. Create processing components with initial settings
+        # 5. Create processing components once, with the initial settings
+        initial_settings = self.get_current_settings()
         self.image_generator = ImageGenerator(
             self.temp_manager,
             self.style_parser,
-            self.get_current_settings()
+            initial_settings
         )
 
         self.video_processor = VideoProcessor(
             self.temp_manager,
-            self.get_current_settings()
+            initial_settings
         )
 
         # 6. Initialize other state
         self.running = False
         self.preview_window = None
+        self._loading_window = None
+        self._preview_cache = OrderedDict()
         self.futures = []
-
-        # 7. Load TTS models
-        self.load_tts_models()
-        self.check_tts_installation()
+        # Narration synthesized alongside video generation, one job at a time
+        self._audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts')
+        # Worker threads hand UI work to the Tk thread through this queue, see _post
+        self._ui_queue = queue.SimpleQueue()
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+
+        # 7. TTS is checked and its models listed on first use, see _ensure_tts_loaded
+        self._tts_loaded = False
+        if self.settings['prewarm_tts']:
+            # Started from the event loop, so the torch import does not delay the first draw
+            self.root.after_idle(self._start_tts_prewarm)
 
         self.update_settings()
 
@@ -231,25 +296,50 @@ class GUIComponents:
             self.cancel_generation()
             self.temp_manager.cleanup()
             
-            # Destroy existing widgets
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Reinitialize entire application
-            self.initialize_app()
-            self.setup_styles()
-            self.create_widgets()
+            # Reset state in place, the widgets, processors and loaded TTS model are kept
+            self._reset_settings()
+            self.update_settings()
             
-            # Force UI update
-            self.root.update_idletasks()
-            messagebox.showinfo("Reset Complete", "Application has been reset to default state")
+            # Reported in the status line rather than a second modal dialog; Tk redraws once this returns
+            self.update_status("Application has been reset to default state", 0)
+
+    def _reset_settings(self):
+        """Restore default settings and clear selected files"""
+        # The caller runs update_settings once afterwards
+        self._batch_updates = True
+        self.text_color_var.set("#FFFFFF")
+        self.bg_color_var.set("#000000")
+        self.font_size_var.set(24)
+        self.border_var.set(True)
+        self.shadow_var.set(False)
+        self.user_value_var.set("0")
+        self.language_var.set("fr")
+        self.tts_soundtrack_var.set(False)
+        self._batch_updates = False
+
+        self.background_image_path = None
+        self.background_music_path = None
+        self.custom_font_path = None
+        self.srt_path = None
+        self.speaker_ref_path = None
+        self.generated_audio_path = None
+        self.settings['background_music'] = None
+        # The generator is reused, so fonts (keyed without the custom font path) and frames must not survive
+        self.image_generator.clear_caches()
+        self._preview_cache.clear()
+
+        self.srt_label.config(text="No SRT file selected")
+        self.ref_audio_label.config(text="No audio selected")
+        self.update_color_labels()
 
     def setup_styles(self):
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        self.style.configure('TButton', font=('Helvetica', 10), padding=5)
-        self.style.configure('TLabel', font=('Helvetica', 10))
-        self.style.configure('Header.TLabel', font=('Helvetica', 10, 'bold'))
+        """Configure the ttk styles once, no setting changes them so reset leaves them alone"""
+        self.style.configure('TFrame', background='#F0F0F0')
+        self.style.configure('TButton', background='#4A90E2', foreground='black',
+                             font=('Helvetica', 10), padding=5)
+        self.style.configure('TLabel', background='#F0F0F0', font=('Helvetica', 10))
+        self.style.configure('Header.TLabel', background='#4A90E2', foreground='white',
+                             font=('Helvetica', 10, 'bold'))
         self.style.configure('Progressbar', thickness=20)
 
     def _safe_int_get(self, var: tk.StringVar, default: int) -> int:
@@ -381,8 +471,9 @@ class GUIComponents:
             ttk.Button(btn_frame, text="Cancel",
                      command=self.cancel_generation).pack(side=tk.LEFT, padx=5)
 
-            ttk.Button(btn_frame, text="Generate TTS Audio",
-                     command=self.start_audio_generation).pack(side=tk.LEFT, padx=5)
+            self.generate_audio_btn = ttk.Button(btn_frame, text="Generate TTS Audio",
+                     command=self.start_audio_generation)
+            self.generate_audio_btn.pack(side=tk.LEFT, padx=5)
 
             #Reset button
             reset_frame = ttk.Frame(self.root)
@@ -413,7 +504,8 @@ class GUIComponents:
                 tts_frame, 
                 textvariable=self.model_var,
                 state='readonly',
-                width=50
+                width=50,
+                postcommand=self._ensure_tts_loaded
             )
             self.model_combo.grid(row=0, column=1, padx=5)
             self.model_combo.bind('<<ComboboxSelected>>', self._on_model_selected)
@@ -437,27 +529,20 @@ class GUIComponents:
             )
             self.lang_combo.grid(row=2, column=1)
             self.lang_combo.set("fr")  # Initial value
-            # Auto-select XTTS model
-            if 'xtts' in SubToAudio().coqui_model():
-                self.model_var.set('xtts')
-                self.language_var.set('fr')  # Default to French
+
+            ttk.Checkbutton(
+                tts_frame,
+                text="Narrate generated video with TTS (replaces background music)",
+                variable=self.tts_soundtrack_var
+            ).grid(row=3, column=0, columnspan=2, sticky='w', pady=5)
             # Reset color labels
             self.text_color_label.config(bg="#FFFFFF", fg="black")
             self.bg_color_label.config(bg="#000000", fg="white")
-            # Set initial model if available
-            try:
-                if 'xtts' in SubToAudio().coqui_model():
-                    self.model_var.set('xtts')
-            except:
-                pass  # Fallback to default model selection
             # Reset checkboxes
             self.border_var.set(True)
             self.shadow_var.set(False)
-            # Auto-load TTS models at startup
-            self.root.after(100, self.load_tts_models)  # Small delay to ensure widgets are ready
 
             self.update_color_labels()
-            self.load_tts_models()
 
         except AttributeError as ae:
             logging.critical(f"Widget creation failed: {str(ae)}")
@@ -469,11 +554,9 @@ class GUIComponents:
         """Validation for integer input (including negatives)"""
         if new_value == "":
             return False  # Disallow empty field
-        try:
-            int(new_value)
-            return True
-        except ValueError:
-            return False
+        # Runs on every keystroke: a plain digit check avoids raising ValueError for rejected input
+        digits = new_value[1:] if new_value[0] == '-' else new_value
+        return digits.isdecimal()
 
     def choose_text_color(self):
         color = colorchooser.askcolor(title="Choose Text Color")
@@ -505,14 +588,18 @@ class GUIComponents:
         self.style_parser.settings = current_settings  # If using styled text
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def is_dark_color(hex_color):
         """Determine if a color is dark using luminance calculation"""
         hex_color = hex_color.lstrip('#')
         if len(hex_color) != 6:
             return False  # Default to light color if invalid
-        r, g, b = (int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
-        return luminance < 0.5
+        try:
+            r, g, b = bytes.fromhex(hex_color)
+        except ValueError:
+            return False  # Non-hex digits, treat as light like other invalid input
+        # luminance < 0.5 in integer form: (0.299r + 0.587g + 0.114b) / 255 < 0.5
+        return 299 * r + 587 * g + 114 * b < 127500
 
     def update_color_labels(self):
         """Update both color labels' appearance"""
@@ -537,11 +624,18 @@ class GUIComponents:
     def choose_font(self):
         file_path = filedialog.askopenfilename(filetypes=[("Font Files", "*.ttf *.otf")])
         if file_path:
-            try:
-                ImageFont.truetype(file_path, 10)  # Quick validation
-                self.custom_font_path = file_path
-            except IOError:
-                messagebox.showerror("Invalid Font", "The selected file is not a valid font.")
+            # Parse the font in the background, large font files would stall the UI
+            future = _IO_POOL.submit(ImageFont.truetype, file_path, 10)  # Quick validation
+            future.add_done_callback(lambda f: self._post(self._on_font_validated, file_path, f))
+
+    def _on_font_validated(self, file_path, future):
+        """Main thread: use the font if it loaded"""
+        if isinstance(future.exception(), IOError):
+            messagebox.showerror("Invalid Font", "The selected file is not a valid font.")
+        elif future.exception() is None:
+            self.custom_font_path = file_path
+        else:
+            logging.error(f"Font validation failed: {future.exception()}")
 
     def choose_background_image(self):
         file_path = filedialog.askopenfilename(filetypes=[("Image Files", "*.jpg *.png *.jpeg")])
@@ -603,26 +697,70 @@ class GUIComponents:
         self.loading_spinner.pack(pady=10)
         self.loading_spinner.start()
 
-        # Start preview generation in thread
-        threading.Thread(
-            target=self._generate_preview_content,
-            args=("Preview Text\n<font size='18'>Styled Text</font>\n<i>Italic</i>",),
-            daemon=True
-        ).start()
+        # Start preview generation on the shared pool
+        self._submit(self._generate_preview_content,
+                     "Preview Text\n<font size='18'>Styled Text</font>\n<i>Italic</i>")
+
+    def _submit(self, fn, *args):
+        """Run fn on the shared pool, logging anything it raises"""
+        future = _IO_POOL.submit(fn, *args)
+        future.add_done_callback(self._log_future_error)
+        return future
+
+    @staticmethod
+    def _log_future_error(future):
+        if not future.cancelled() and future.exception():
+            logging.error(f"Background task failed: {future.exception()}", exc_info=future.exception())
 
     def _generate_preview_content(self, sample_text: str):
         """
         Generate preview content with the current style settings.
         """
         try:
+            key = self._preview_key(sample_text, self.image_generator.settings)
+            photo = self._preview_cache.get(key)
+            if photo is not None:
+                self._preview_cache.move_to_end(key)
+                self._post(self._update_preview_window, photo)
+                return
+
             preview_image = self.image_generator.generate_image(sample_text)
             if preview_image:
-                # Convert PIL image to PhotoImage
-                photo = ImageTk.PhotoImage(preview_image)
-                self.root.after(0, self._update_preview_window, photo)
+                # Tk images must be created on the main thread
+                self._post(self._finalize_preview, key, preview_image)
         except Exception as e:
             logging.error(f"Preview generation failed: {str(e)}")
-            self.root.after(0, self._show_preview_error)
+            self._post(self._show_preview_error)
+
+    def _finalize_preview(self, key, preview_image):
+        """Main thread: convert the rendered preview to a PhotoImage, cache and show it"""
+        photo = ImageTk.PhotoImage(preview_image)
+        self._preview_cache[key] = photo
+        if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+        self._update_preview_window(photo)
+
+    @staticmethod
+    def _preview_key(sample_text: str, settings: dict) -> tuple:
+        """Everything the preview depends on; files are keyed by path and mtime so edits re-render"""
+        def file_key(path):
+            if not path:
+                return None
+            try:
+                return path, os.path.getmtime(path)
+            except OSError:
+                return path, None
+
+        return (
+            sample_text,
+            settings.get('text_color'),
+            settings.get('bg_color'),
+            settings.get('font_size'),
+            settings.get('text_border'),
+            settings.get('text_shadow'),
+            file_key(settings.get('background_image')),
+            file_key(settings.get('custom_font'))
+        )
 
     def _update_preview_window(self, photo):
         """
@@ -671,15 +809,17 @@ class GUIComponents:
                 messagebox.showerror("Error", "Please select an SRT file first")
                 return
 
-            try:
-                self.running = True
-                threading.Thread(
-                    target=self.prompt_for_output_and_generate,
-                    daemon=True
-                ).start()
-            except ValueError:
-                messagebox.showerror("Invalid Input", "Please enter a valid integer")
-                self.running = False
+            self.running = True
+            future = self._submit(self.prompt_for_output_and_generate)
+            future.add_done_callback(self._on_prompt_done)
+
+    def _on_prompt_done(self, future):
+        """Re-enable generation if the output prompt failed (e.g. an invalid delay)"""
+        if not future.cancelled() and isinstance(future.exception(), ValueError):
+            self.running = False
+            self._post(messagebox.showerror, "Invalid Input", "Please enter a valid integer")
+        elif future.cancelled() or future.exception():
+            self.running = False
 
     def run_external_script(self, delay: int):
         try:
@@ -699,124 +839,7 @@ class GUIComponents:
             
     def adjust_srt_directly(self, input_path, delay_ms, output_path):
         """Adjust SRT timecodes directly without calling external script"""
-        try:
-            # Import re for regex operations
-            import re
-            import codecs
-            
-            logging.info(f"Adjusting SRT file: {input_path} with delay {delay_ms}ms")
-            
-            # Try multiple encodings to handle different file formats
-            encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'cp1252']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with codecs.open(input_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    if content and content.strip():
-                        logging.info(f"Successfully read SRT file with encoding: {encoding}")
-                        break
-                except UnicodeDecodeError:
-                    continue
-            
-            # No need to redefine methods here - we'll use the class-level method
-            if not content or not content.strip():
-                raise RuntimeError(f"SRT file is empty or cannot be decoded: {input_path}")
-                
-            # Pattern to match timecode lines
-            # Format: 00:00:00,000 --> 00:00:00,000
-            timecode_pattern = re.compile(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})')
-            
-            # Normalize line endings to ensure consistent splitting
-            content = content.replace('\r\n', '\n').replace('\r', '\n')
-            
-            # Validate SRT format - try different splitting patterns
-            entries = re.split(r'\n\n+', content.strip())
-            if len(entries) < 1:
-                # Try alternative splitting
-                entries = re.split(r'\d+\n\d{2}:\d{2}:\d{2},\d{3}\s*-->', content.strip())
-                entries = [e for e in entries if e.strip()]
-            
-            if len(entries) < 1:
-                logging.error(f"Invalid SRT format: no entries found in {input_path}")
-                logging.error(f"Content sample: {content[:200]}...")
-                raise RuntimeError(f"Invalid SRT format: no entries found in {input_path}")
-                
-            # Check if first entry has valid format (number, timecode, text)
-            first_entry = entries[0].split('\n')
-            if len(first_entry) < 2 or not any(timecode_pattern.search(line) for line in first_entry):
-                logging.error(f"Invalid SRT format: first entry doesn't match expected format")
-                logging.error(f"First entry: {entries[0]}")
-                raise RuntimeError(f"Invalid SRT format in {input_path}")
-            
-            logging.info(f"Found {len(entries)} subtitle entries to adjust")
-            
-            def adjust_timecode(match):
-                # Convert matched groups to integers
-                h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
-                
-                # Convert to milliseconds
-                time1_ms = h1 * 3600000 + m1 * 60000 + s1 * 1000 + ms1
-                time2_ms = h2 * 3600000 + m2 * 60000 + s2 * 1000 + ms2
-                
-                # Apply delay
-                time1_ms += delay_ms
-                time2_ms += delay_ms
-                
-                # Ensure times are not negative
-                time1_ms = max(0, time1_ms)
-                time2_ms = max(0, time2_ms)
-                
-                # Convert back to timecode format
-                h1 = time1_ms // 3600000
-                m1 = (time1_ms % 3600000) // 60000
-                s1 = (time1_ms % 60000) // 1000
-                ms1 = time1_ms % 1000
-                
-                h2 = time2_ms // 3600000
-                m2 = (time2_ms % 3600000) // 60000
-                s2 = (time2_ms % 60000) // 1000
-                ms2 = time2_ms % 1000
-                
-                # Format back to timecode
-                return f"{h1:02d}:{m1:02d}:{s1:02d},{ms1:03d} --> {h2:02d}:{m2:02d}:{s2:02d},{ms2:03d}"
-            
-            # Adjust the timecodes in the content
-            adjusted_content = timecode_pattern.sub(adjust_timecode, content)
-            
-            # Write to output file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(adjusted_content)
-            
-            # Verify file was created and has content
-            if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-                raise RuntimeError("Failed to create valid adjusted SRT file")
-            
-            # Validate the adjusted file
-            with open(output_path, 'r', encoding='utf-8') as f:
-                check_content = f.read()
-                if not timecode_pattern.search(check_content):
-                    logging.warning("No timecodes found in adjusted SRT file")
-                    # If no timecodes found, use original file as fallback
-                    logging.info(f"Using original SRT file as fallback")
-                    return input_path
-                
-                # Verify entries in adjusted file
-                adjusted_entries = re.split(r'\r?\n\r?\n', check_content.strip())
-                if len(adjusted_entries) < 1:
-                    logging.warning("No valid entries in adjusted SRT file, using original")
-                    return input_path
-                    
-                logging.info(f"Adjusted SRT has {len(adjusted_entries)} entries")
-            
-            logging.info(f"SRT adjustment completed, saved to: {output_path}")
-            return output_path
-        except Exception as e:
-            logging.error(f"Error adjusting SRT directly: {e}", exc_info=True)
-            # Fall back to original file if adjustment fails
-            logging.info(f"Using original SRT file as fallback due to error")
-            return input_path
+        return adjust_srt(input_path, delay_ms, output_path)
 
     def prompt_for_output_and_generate(self):
         """Main thread: Get output path and start processing"""
@@ -840,9 +863,35 @@ class GUIComponents:
             self.running = False
 
     def update_status(self, message: str, progress: int):
-        self.root.after(0, self.progress_label.config, {'text': message})
-        self.root.after(0, self.progress.configure, {'value': progress})
-        self.root.update_idletasks()
+        self._post(self._apply_status, message, progress)
+
+    def _apply_status(self, message: str, progress: int):
+        self.progress_label.config(text=message)
+        self.progress.configure(value=progress)
+
+    def _post(self, fn, *args):
+        """Queue fn(*args) to run on the Tk thread, safe to call from worker threads"""
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self):
+        """Tk thread: run the callbacks queued since the last poll"""
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+        items = []
+        while True:
+            try:
+                items.append(self._ui_queue.get_nowait())
+            except queue.Empty:
+                break
+        # Only the newest status is visible, so older ones from the same poll are skipped
+        last_status = max((i for i, (fn, _) in enumerate(items) if fn == self._apply_status), default=-1)
+        for i, (fn, args) in enumerate(items):
+            if fn == self._apply_status and i != last_status:
+                continue
+            # One failing callback (e.g. a widget already destroyed) must not drop the rest of the batch
+            try:
+                fn(*args)
+            except Exception as e:
+                logging.error(f"UI update failed: {str(e)}", exc_info=True)
 
     def cancel_generation(self):
         if self.running:
@@ -866,18 +915,19 @@ class GUIComponents:
             self.video_processor.process(self.srt_path)
             
             # Show completion message
-            self.root.after(0, lambda: self.progress_label.config(text="Video generation complete!"))
-            self.root.after(0, lambda: messagebox.showinfo("Success", "Video generation completed successfully!"))
+            self._post(lambda: self.progress_label.config(text="Video generation complete!"))
+            self._post(lambda: messagebox.showinfo("Success", "Video generation completed successfully!"))
             
         except Exception as e:
             logging.error(f"Video processing error: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Video processing failed: {str(e)}"))
+            self._post(messagebox.showerror, "Error", f"Video processing failed: {str(e)}")
 
     def start_audio_generation(self):
         """Start audio generation only"""
         if not self.srt_path:
             messagebox.showerror("Error", "Please select an SRT file first")
             return
+        self._ensure_tts_loaded()
 
         try:
             self.running = True
@@ -895,11 +945,11 @@ class GUIComponents:
         try:
             # Check prerequisites
             if not self.srt_path:
-                messagebox.showerror("Error", "Please select an SRT file first")
+                self._post(messagebox.showerror, "Error", "Please select an SRT file first")
                 return
     
             if not self.current_tts:
-                messagebox.showerror("Error", "Please select a TTS model first")
+                self._post(messagebox.showerror, "Error", "Please select a TTS model first")
                 return
     
             self.update_status("Generating audio...", 0)
@@ -915,34 +965,47 @@ class GUIComponents:
             # Call the audio generation method
             self.generate_audio(output_path)
             self.update_status("Audio generation complete!", 100)
-            self.root.after(0, lambda: messagebox.showinfo("Success", f"Audio saved to:\n{output_path}"))
+            self._post(lambda: messagebox.showinfo("Success", f"Audio saved to:\n{output_path}"))
             
         except Exception as e:
             error_message = str(e)  # Capture the error message
             logging.error(f"Audio generation failed: {error_message}", exc_info=True)
             self.update_status(f"Error: {error_message}", 0)
             # Use default argument to properly capture the error message in the lambda
-            self.root.after(0, lambda msg=error_message: messagebox.showerror("Error", f"Audio generation failed: {msg}"))
+            self._post(lambda msg=error_message: messagebox.showerror("Error", f"Audio generation failed: {msg}"))
         finally:
             self.running = False
-    def generate_audio(self, output_path):
-        """Generate audio (ensure this is properly synchronous)"""
+    def generate_audio(self, output_path, srt_path=None, narration=False):
+        """Generate audio (ensure this is properly synchronous)
+
+        srt_path defaults to the selected SRT file. narration=True is for a video run's
+        soundtrack: the status line is left to the video and the audio is not kept as
+        background music. Synthesis stops between entries once self.running is cleared.
+        """
         if not self.current_tts:
             raise RuntimeError("No TTS model initialized")
         
-        if not self.srt_path or not os.path.exists(self.srt_path):
+        srt_path = srt_path or self.srt_path
+        if not srt_path or not os.path.exists(srt_path):
             raise RuntimeError("Valid SRT file not found")
         
         try:
             # Get language value safely
             language = self.lang_combo.get() if hasattr(self, 'lang_combo') and self.lang_combo else self.language_var.get()
             
-            # Prepare conversion parameters
+            # Prepare conversion parameters; synthesis fills the bar up to 90%, mixing and writing the rest
             convert_params = {
-                'sub_data': self.current_tts.subtitle(self.srt_path),
+                'sub_data': self.current_tts.subtitle(srt_path),
                 'language': language,
                 'output_path': output_path
             }
+
+            def on_entry_done(done, total):
+                if not self.running:
+                    raise RuntimeError("Audio generation cancelled")
+                if not narration:
+                    self.update_status(f"Generating audio... {done}/{total}", 90 * done // total)
+            convert_params['progress_callback'] = on_entry_done
             
             # Add speaker_wav only if provided
             if self.speaker_ref_path:
@@ -961,7 +1024,8 @@ class GUIComponents:
                 self.current_tts.convert_to_audio(**convert_params)
             except AttributeError as ae:
                 if "'GPT2InferenceModel' object has no attribute 'generate'" in str(ae):
-                    messagebox.showerror(
+                    self._post(
+                        messagebox.showerror,
                         "TTS Version Error",
                         "Your TTS library version is incompatible with XTTS model.\n"
                         "Please update TTS library by running:\n"
@@ -976,35 +1040,73 @@ class GUIComponents:
             if not os.path.exists(output_path):
                 raise RuntimeError("TTS failed to generate audio file")
                 
-            # Update path only after successful generation
-            self.generated_audio_path = output_path
-            self.settings['background_music'] = output_path
+            # Update path only after successful generation; narration lives in the run's temp tree
+            if not narration:
+                self.generated_audio_path = output_path
+                self.settings['background_music'] = output_path
         except Exception as e:
             logging.error(f"Audio generation failed: {str(e)}", exc_info=True)
             # Re-raise the exception to be handled by the caller
             raise
 
 
+    def _start_tts_prewarm(self):
+        """Construct the shared model-less SubToAudio on a daemon thread"""
+        threading.Thread(target=self._prewarm_tts, daemon=True).start()
+
+    @staticmethod
+    def _prewarm_tts():
+        """Background thread: pay the TTS import and model manager setup before first use"""
+        try:
+            _get_sub_to_audio()
+        except Exception as e:
+            logging.warning(f"TTS prewarm failed: {str(e)}")
+
+    def _ensure_tts_loaded(self):
+        """Check the TTS install and list its models the first time TTS is used"""
+        if self._tts_loaded:
+            return
+        self._tts_loaded = True
+        # Enumeration also auto-selects the XTTS model when it is available
+        self.load_tts_models()
+        self.check_tts_installation()
+
     def check_tts_installation(self):
-        """Verify TTS is properly installed and has models"""
+        """Verify TTS is properly installed and has models, off the Tk thread"""
+        # Importing Coqui/torch and listing models takes seconds, the result comes back via _post
+        future = _IO_POOL.submit(self._tts_has_models)
+        future.add_done_callback(self._on_tts_checked)
+
+    @staticmethod
+    def _tts_has_models() -> bool:
+        """Worker thread: whether Coqui TTS lists any models"""
+        from TTS.api import TTS
+        return bool(TTS().list_models())
+
+    def _on_tts_checked(self, future):
+        """Report a missing TTS install or missing models; TTS is optional, so the app keeps running"""
         try:
-            from TTS.api import TTS
-            temp_tts = TTS()
-            if not temp_tts.list_models():
-                messagebox.showwarning(
-                    "Missing Models",
-                    "No TTS models installed!\n"
-                    "Please install at least one model to continue.\n"
-                    "You can install models via command line:\n"
-                    "tts --model_name [model_name] --model_path [path/to/model]"
-                )
+            has_models = future.result()
         except ImportError:
-            messagebox.showerror(
+            self._post(
+                messagebox.showerror,
                 "Missing Dependency",
                 "Coqui TTS not installed!\n"
                 "Install with: pip install TTS"
             )
-            self.root.destroy()
+            return
+        except Exception as e:
+            logging.error(f"TTS installation check failed: {str(e)}")
+            return
+        if not has_models:
+            self._post(
+                messagebox.showwarning,
+                "Missing Models",
+                "No TTS models installed!\n"
+                "Please install at least one model to continue.\n"
+                "You can install models via command line:\n"
+                "tts --model_name [model_name] --model_path [path/to/model]"
+            )
 
     def load_tts_models(self):
         """Load available TTS models into combobox"""
@@ -1013,22 +1115,27 @@ class GUIComponents:
             self.model_combo.set("Loading models...")
             self.model_combo.configure(state='disabled')
             
-            # Start loading in background
-            threading.Thread(target=self._populate_models, daemon=True).start()
-
-    def _populate_models(self):
-        """Thread-safe model loading"""
+            # Scan on the shared pool and hand the result back to the Tk thread
+            future = _IO_POOL.submit(self._list_tts_models)
+            future.add_done_callback(self._on_tts_models_listed)
+
+    def _list_tts_models(self) -> List[str]:
+        """Worker thread: list the installed TTS models"""
+        # One instance for the whole scan, it only lists and checks model files
+        tts = _get_sub_to_audio()
+        model_names = tts.coqui_model()
+        return [m for m in model_names if tts._model_exists(m)]
+
+    def _on_tts_models_listed(self, future):
+        """Schedule the model dropdown update on the main thread"""
         try:
-            model_names = SubToAudio().coqui_model()
-                 
-            valid_models = [m for m in model_names if SubToAudio()._model_exists(m)]
-            
-            # Update the UI with models in the main thread
-            self.root.after(0, lambda: self._update_model_dropdown(valid_models))
+            valid_models = future.result()
         except Exception as e:
             logging.error(f"Error loading TTS models: {str(e)}")
-            self.root.after(0, lambda: self.model_combo.configure(state='readonly'))
-            self.root.after(0, lambda: self.model_combo.set("Error loading models"))
+            self._post(lambda: self.model_combo.configure(state='readonly'))
+            self._post(lambda: self.model_combo.set("Error loading models"))
+            return
+        self._post(self._update_model_dropdown, valid_models)
             
     def _on_model_selected(self, event=None):
         """Handle model selection and populate languages"""
@@ -1037,19 +1144,25 @@ class GUIComponents:
             return
 
         # Show loading indicator
-        loading_window = tk.Toplevel(self.root)
-        loading_window.title("Loading Model")
-        loading_window.geometry("300x100")
-        loading_window.transient(self.root)
+        loading_window, progress = self._get_loading_window()
+        loading_window.deiconify()
         loading_window.grab_set()
-        
-        loading_label = ttk.Label(loading_window, text="Loading model, please wait...", padding=20)
-        loading_label.pack()
-        
-        progress = ttk.Progressbar(loading_window, mode='indeterminate')
-        progress.pack(padx=20, fill=tk.X)
         progress.start()
 
+        # Closing the loading window releases its grab, so lock the TTS controls
+        # until the load finishes rather than let a second selection start another one
+        locked_widgets = [(self.model_combo, 'readonly'), (self.lang_combo, 'readonly'),
+                          (self.generate_audio_btn, 'normal')]
+        for widget, _ in locked_widgets:
+            widget.configure(state='disabled')
+
+        def unlock():
+            progress.stop()
+            loading_window.grab_release()
+            loading_window.withdraw()
+            for widget, state in locked_widgets:
+                widget.configure(state=state)
+
         def load_model():
             try:
                 # Check if using XTTS model
@@ -1059,7 +1172,7 @@ class GUIComponents:
                         from TTS import __version__ as tts_version
                         from packaging import version
                         if version.parse(tts_version) < version.parse('0.14.0'):
-                            self.root.after(0, lambda: messagebox.showwarning(
+                            self._post(lambda: messagebox.showwarning(
                                 "TTS Version Warning",
                                 f"Your TTS version ({tts_version}) might not be compatible with XTTS model.\n"
                                 "Consider updating with: pip install -U TTS"
@@ -1069,14 +1182,13 @@ class GUIComponents:
                         pass
 
                 try:
-                    self.current_tts = SubToAudio(model_name=model)
+                    self.current_tts = _get_sub_to_audio(model)
                     langs = self.current_tts.languages()
-                    self.root.after(0, lambda: self._update_languages(langs))
+                    self._post(lambda: self._update_languages(langs))
                 except Exception as e:
                     # Check for JSON decode error (corrupted/empty model files)
                     import json
                     import shutil
-                    import re
                     error_str = str(e)
                     # Also check for "invalid load key" error (e.g., loading HTML instead of model)
                     is_corrupted = (
@@ -1103,21 +1215,39 @@ class GUIComponents:
                                 if not removed_any:
                                     logging.warning(f"No model directory found to remove for corrupted model: {model_name_safe}")
 
-                            self.root.after(0, lambda: messagebox.showerror(
+                            self._post(lambda: messagebox.showerror(
                                 "Corrupted Model",
                                 "The selected TTS model appears to be corrupted or incomplete.\n"
                                 "It has been deleted. Please try selecting the model again to re-download it."
                             ))
                         except Exception as cleanup_err:
                             logging.error(f"Failed to cleanup corrupted model: {cleanup_err}")
-                            self.root.after(0, lambda: messagebox.showerror("Model Error", f"Failed to initialize model and could not clean up cache: {error_str}"))
+                            self._post(lambda: messagebox.showerror("Model Error", f"Failed to initialize model and could not clean up cache: {error_str}"))
                     else:
-                        self.root.after(0, lambda: messagebox.showerror("Model Error", f"Failed to initialize model: {error_str}"))
+                        self._post(lambda: messagebox.showerror("Model Error", f"Failed to initialize model: {error_str}"))
             finally:
-                self.root.after(0, loading_window.destroy)
+                self._post(unlock)
         # Start loading in background
         threading.Thread(target=load_model, daemon=True).start()
 
+    def _get_loading_window(self):
+        """Build the model loading window on first use, later loads show the same hidden window"""
+        if self._loading_window is None:
+            loading_window = tk.Toplevel(self.root)
+            loading_window.title("Loading Model")
+            loading_window.geometry("300x100")
+            loading_window.transient(self.root)
+            # Closing only hides it, so it can be shown again for the next load
+            loading_window.protocol("WM_DELETE_WINDOW", loading_window.withdraw)
+
+            loading_label = ttk.Label(loading_window, text="Loading model, please wait...", padding=20)
+            loading_label.pack()
+
+            progress = ttk.Progressbar(loading_window, mode='indeterminate')
+            progress.pack(padx=20, fill=tk.X)
+            self._loading_window = (loading_window, progress)
+        return self._loading_window
+
     @staticmethod
     def _get_tts_home_path():
         """Get the default TTS installation directory based on the OS."""
@@ -1162,6 +1292,7 @@ class GUIComponents:
             self.model_combo.configure(state='readonly')
     def generate_video(self, output_path: str, srt_path: str) -> None:
         """Process subtitle entries into a video with audio"""
+        audio_future = None
         try:
             self.update_settings()
             self.update_status("Initializing video generation...", 0)
@@ -1178,21 +1309,19 @@ class GUIComponents:
             
             entries = self.srt_parser.parse(adjusted_srt)
             
+            # parse only returns entries with valid, ordered start and end times
             if not entries:
                 raise ValueError("No valid subtitle entries found in adjusted SRT file")
-            
-            # Validate entries for missing 'start_time' or 'end_time'
-            for i, entry in enumerate(entries):
-                if 'start_time' not in entry or 'end_time' not in entry:
-                    raise ValueError(f"Entry {i + 1} is missing 'start_time' or 'end_time'")
-            
-            if not entries:
-                raise ValueError("No valid subtitle entries found in adjusted SRT file")
-            
-            # Validate entries for missing 'start_time' or 'end_time'
-            for i, entry in enumerate(entries):
-                if 'start_time' not in entry or 'end_time' not in entry:
-                    raise ValueError(f"Entry {i + 1} is missing 'start_time' or 'end_time'")
+
+            # TTS narration is synthesized from the same timings while the images are rendered and encoded
+            audio_input = self.settings.get('background_music')
+            if self.tts_soundtrack_var.get():
+                if not self.current_tts:
+                    raise RuntimeError("Select a TTS model to narrate the video")
+                narration_path = os.path.join(self.temp_manager.temp_dir, "narration.wav")
+                audio_future = self._audio_executor.submit(
+                    self.generate_audio, narration_path, adjusted_srt, narration=True
+                )
 
             # 3. Generate subtitle images with quality checks
             self.update_status("Generating subtitle images...", 20)
@@ -1212,17 +1341,23 @@ class GUIComponents:
             # 5. Process in batches with progress tracking
             self.update_status("Processing video batches...", 30)
             batch_size = self.settings.get('batch_size', 50)
-            image_paths = [img['path'] for img in images]
-            batches = [images[i:i+batch_size] for i in range(0, len(images), batch_size)]
-
-            segments = []
-            with ThreadPoolExecutor(max_workers=2) as executor:
+            # Batch idx covers images[idx * batch_size:(idx + 1) * batch_size], sliced only where needed
+            batch_count = -(-len(images) // batch_size)
+
+            segments = [None] * batch_count  # Filled by batch index, so kept in order
+            completed = 0
+            video_duration = 0.0  # Exact length of the encoded segments, summed as each batch lands
+            # Batches are validated here and encoded in worker processes, one ffmpeg each,
+            # as many at once as the encoder supports (see VideoProcessor._encode_workers)
+            jobs = [
+                self.video_processor.prepare_batch(images[start:start + batch_size], idx)
+                for idx, start in enumerate(range(0, len(images), batch_size))
+            ]
+            workers = VideoProcessor._encode_workers()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ENCODE_MP_CONTEXT) as executor:
                 future_to_batch = {
-                    executor.submit(
-                        self.video_processor.process_batch,  # Method reference
-                        batch,            # 1st argument (List[Dict])
-                        idx              # 2nd argument (int)
-                    ): idx for idx, batch in enumerate(batches)
+                    executor.submit(encode_batch, job, idx, workers): idx
+                    for idx, job in enumerate(jobs) if job is not None
                 }
 
                 self.futures = list(future_to_batch.keys())
@@ -1230,38 +1365,56 @@ class GUIComponents:
                 for future in concurrent.futures.as_completed(future_to_batch):
                     try:
                         segment_path = future.result()
-                        if segment_path and os.path.exists(segment_path):
-                            segments.append(segment_path)
-                            progress = 30 + 60 * len(segments)//len(batches)
-                            self.update_status(f"Processed {len(segments)}/{len(batches)} batches", progress)
+                        if segment_path and self.video_processor.is_valid_video(segment_path):
+                            segments[future_to_batch[future]] = segment_path
+                            _, frame_counts, _, frame_rate, _ = jobs[future_to_batch[future]]
+                            video_duration += sum(frame_counts) / frame_rate
+                            completed += 1
+                            progress = 30 + 60 * completed//batch_count
+                            self.update_status(f"Processed {completed}/{batch_count} batches", progress)
                     except Exception as e:
-                        logging.error(f"Batch processing failed: {str(e)}")
-                        self._save_batch_debug_info(batches[future_to_batch[future]], future_to_batch[future])
+                        batch_idx = future_to_batch[future]
+                        logging.error(f"Batch {batch_idx} processing failed: {str(e)}")
+                        logging.debug("Batch %d frames: %s", batch_idx, jobs[batch_idx][0])
 
             # 6. Combine video segments
+            segments = [seg for seg in segments if seg]
             if not segments:
                 raise RuntimeError("No valid video segments created")
 
+            if audio_future is not None:
+                self.update_status("Waiting for TTS narration...", 90)
+                audio_future.result()  # Re-raises a failed synthesis
+                audio_input = narration_path
+
             self.update_status("Finalizing video...", 90)
             final_video = self.video_processor.combine_segments(
                 segments,
                 output_path,
-                self.settings.get('background_music')
+                audio_input,
+                video_duration=video_duration
             )
             
             # 8. Cleanup and completion
             self.safe_cleanup(segments)
             
             self.update_status("Video creation complete!", 100)
-            messagebox.showinfo("Success", f"Video saved to:\n{output_path}")
+            self._post(messagebox.showinfo, "Success", f"Video saved to:\n{output_path}")
 
         except Exception as e:
             error_msg = f"Video generation failed: {str(e)}"
             logging.error(error_msg, exc_info=True)
-            self.root.after(0, messagebox.showerror, "Processing Error", error_msg)
+            self._post(messagebox.showerror, "Processing Error", error_msg)
         finally:
             self.running = False
             self.futures = []
+            # A failed or cancelled run must not leave narration writing into the temp tree
+            # or queued ahead of the next run; clearing running stops it after the current entry
+            if audio_future is not None and not audio_future.cancel():
+                try:
+                    audio_future.result()
+                except Exception:
+                    pass  # Already reported, or the run failed for another reason
 
     def validate_images(self, paths: List[str]) -> dict:
         """Validate image files for corruption and dimensions"""
@@ -1271,22 +1424,14 @@ class GUIComponents:
             'checked': len(paths)
         }
 
-        for path in paths:
-            try:
-                if not os.path.exists(path):
-                    results['errors'].append(f"Missing file: {path}")
-                    continue
-
-                with Image.open(path) as img:
-                    img.verify()
-                    if img.size != self.expected_dimensions:
-                        results['errors'].append(
-                            f"Dimension mismatch in {os.path.basename(path)}: "
-                            f"Expected {self.expected_dimensions}, Got {img.size}"
-                        )
-
-            except Exception as e:
-                results['errors'].append(f"Invalid image {os.path.basename(path)}: {str(e)}")
+        # Compared against header and PIL sizes, which are tuples; a list would never match
+        expected_dims = tuple(self.expected_dimensions)
+        # PIL releases the GIL while reading and decoding, so the shared pool checks files in parallel
+        if len(paths) > 1:
+            errors = _IO_POOL.map(partial(_validate_one, expected_dims=expected_dims), paths)
+        else:
+            errors = [_validate_one(path, expected_dims) for path in paths]
+        results['errors'] = [error for error in errors if error]
 
         results['success'] = len(results['errors']) == 0
         return results        
@@ -1294,14 +1439,16 @@ class GUIComponents:
     def safe_cleanup(self, segments):
         """Clean temporary files with validation"""
         try:
-            # Clean temp SRT
-            if os.path.exists("temp.srt"):
-                os.remove("temp.srt")
-
-            # Clean video segments
-            for seg in segments:
-                if os.path.exists(seg):
-                    os.remove(seg)
+            # Clean the temp SRT and video segments; those under the temp tree go with it in one rmtree below.
+            # Removing and ignoring missing files costs one syscall per file instead of a stat plus an unlink
+            temp_roots = tuple(os.path.join(os.path.abspath(d), '')
+                               for d in (self.temp_manager.root_dir, self.temp_manager.process_dir))
+            for path in ["temp.srt", *segments]:
+                if not os.path.abspath(path).startswith(temp_roots):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
 
             # Clean temp manager files
             self.temp_manager.cleanup()
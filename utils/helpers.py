@@ -1,25 +1,48 @@
 import os
 import shutil
+import struct
+import sys
+import tempfile
 import time
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 from threading import Thread, Event
 from datetime import datetime, timedelta
 import uuid
 
+RAM_DISK_DIR = '/dev/shm'
+
 class TempFileManager:
-    def __init__(self, root_dir: Optional[str] = None, log_file: Optional[str] = None):
+    def __init__(self, root_dir: Optional[str] = None, log_file: Optional[str] = None,
+                 use_ram_disk: bool = False):
         """
         Initialize the TempFileManager with configurable root directory and log file.
+
+        With use_ram_disk on Linux, the process directory (video segments and
+        other intermediate ffmpeg files) is created on tmpfs under /dev/shm.
         """
         self.root_dir = os.path.abspath(root_dir) if root_dir else os.path.abspath("video_gen_temp")
         self.image_dir = os.path.join(self.root_dir, "images")
-        self.process_dir = os.path.join(self.root_dir, "process")
+        self.process_dir = self._ram_disk_process_dir() if use_ram_disk else None
+        if not self.process_dir:
+            self.process_dir = os.path.join(self.root_dir, "process")
         self.temp_dir = os.path.join(self.root_dir, "temp")
         self.log_file = log_file if log_file else os.path.join(self.root_dir, "srt_converter.log")
         self._stop_event = Event()  # Event to stop the log cleaner thread
         self._init_dirs()
         self._start_log_cleaner()
+
+    @staticmethod
+    def _ram_disk_process_dir() -> Optional[str]:
+        """Create a process directory on tmpfs, or return None when unavailable."""
+        if not sys.platform.startswith('linux') or not os.path.isdir(RAM_DISK_DIR):
+            return None
+        try:
+            return tempfile.mkdtemp(prefix="video_gen_process_", dir=RAM_DISK_DIR)
+        except OSError as e:
+            logging.warning(f"RAM disk unavailable, using disk for temp files: {str(e)}")
+            return None
+
     def _init_dirs(self):
         """Initialize required directories."""
         for d in [self.image_dir, self.process_dir, self.temp_dir]:
@@ -55,11 +78,17 @@ class TempFileManager:
         """Clean temporary directories."""
         try:
             shutil.rmtree(self.root_dir, ignore_errors=False)  # Raise errors for debugging
+            if os.path.exists(self.process_dir):  # Lives outside root_dir on a RAM disk
+                shutil.rmtree(self.process_dir, ignore_errors=False)
             self._init_dirs()
         except Exception as e:
             logging.error(f"Cleanup error: {str(e)}")
             raise  # Re-raise the exception for debugging
 
+    def cleanup_dir(self, path: str):
+        """Remove a single directory created under the temp tree."""
+        shutil.rmtree(path, ignore_errors=True)
+
     def full_cleanup(self):
         """Clean everything including logs."""
         self._stop_event.set()  # Stop the log cleaner thread
@@ -69,4 +98,47 @@ class TempFileManager:
     def verify_file(self, filename: str) -> bool:
         """Check if a file exists in the root directory and is not empty."""
         path = os.path.join(self.root_dir, filename)
-        return os.path.exists(path) and os.path.getsize(path) > 0
\ No newline at end of file
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# PNG colour type -> PIL mode, for 8-bit images
+PNG_MODES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+# JPEG start-of-frame markers (SOF0-SOF15 without DHT, JPG and DAC)
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def read_image_header(path: str) -> Optional[Tuple[int, int, str]]:
+    """
+    Read width, height and PIL colour mode from a PNG or JPEG header
+    without decoding the image.
+
+    Returns None for other formats or headers that cannot be parsed,
+    in which case callers should fall back to PIL.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(26)
+        if header[:8] == PNG_SIGNATURE and header[12:16] == b'IHDR':
+            width, height, bit_depth, color_type = struct.unpack('>IIBB', header[16:26])
+            mode = PNG_MODES.get(color_type) if bit_depth == 8 else None
+            return (width, height, mode) if mode else None
+
+        if header[:2] != b'\xff\xd8':
+            return None
+
+        # Walk the JPEG segments up to the first start-of-frame marker
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] in JPEG_SOF_MARKERS:
+                segment = f.read(8)
+                if len(segment) < 8:
+                    return None
+                height, width, components = struct.unpack('>HHB', segment[3:8])
+                mode = JPEG_MODES.get(components)
+                return (width, height, mode) if mode else None
+            length = f.read(2)
+            if len(length) < 2:
+                return None
+            f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)